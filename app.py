@@ -8,19 +8,13 @@ A Streamlit application for tracking and analyzing exam performance through:
 """
 
 from datetime import date
-from typing import Any, Dict, List, cast
+from typing import Any, Dict, List, Tuple
 
-import pandas as pd
 import streamlit as st
 from streamlit_cookies_controller import CookieController
 
 from assets import styles
-from config import (
-    DEFAULT_DIFFICULTY,
-    DEFAULT_ERROR_TYPE,
-    AppConfig,
-    TimeFilter,
-)
+from config import AppConfig, TimeFilter
 from config.icons import (
     ICON_DASHBOARD,
     ICON_HISTORY,
@@ -28,14 +22,10 @@ from config.icons import (
     ICON_MOCK_ANALYSIS,
 )
 from src.interface.streamlit import components as ui
-from src.interface.streamlit import dashboard_components as dash
-from src.interface.streamlit import history_components as hist
 from src.interface.streamlit import login_component
-from src.interface.streamlit import mock_exam_analysis_components as mock_analysis
-from src.interface.streamlit import telemetry_components as telemetry
-from src.services import auth_service, excel_service
+from src.services import auth_service
+from src.services import cache_service as cache
 from src.services import db_service as db
-from src.services.db_service import supabase
 
 # App Configuration
 st.set_page_config(
@@ -45,23 +35,28 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Sidebar menu entries: (label, menu value, icon)
+_MENU_ITEMS: Tuple[Tuple[str, str, str], ...] = (
+    ("Dashboard", "Dashboard", ICON_DASHBOARD),
+    ("Log Session", "Log Session", ICON_LOG_ERROR),
+    ("Mock Analysis", "Mock Analysis", ICON_MOCK_ANALYSIS),
+    ("History", "History", ICON_HISTORY),
+)
+
+# Static markup, built once at import instead of on every rerun
+_LOADING_HTML: str = """
+<div style="display:flex;flex-direction:column;align-items:center;justify-content:center;height:60vh;">
+    <p style="color:#94a3b8;font-size:1.1rem;">Loading session...</p>
+</div>
+"""
+
 
 def init_session_state() -> None:
     """Initialize all session state defaults."""
     defaults = {
         "user": None,
-        "subject_input": "",
-        "topic_input": "",
-        "description_input": "",
-        "error_type_select": DEFAULT_ERROR_TYPE,
-        "difficulty_select": DEFAULT_DIFFICULTY,
-        "date_input": date.today(),
         "time_filter": TimeFilter.DEFAULT,
-        "reset_form": False,
-        "success_message": "",
-        "show_success": False,
         "chart_view": 0,
-        "current_menu": "Dashboard",
     }
     for key, value in defaults.items():
         if key not in st.session_state:
@@ -71,21 +66,31 @@ def init_session_state() -> None:
 init_session_state()
 styles.local_css()
 
+# Snapshot the auth state once; the bootstrap below branches on these locals
+# and only writes back to session state when something changes
+user = st.session_state["user"]
+cookies_loaded = st.session_state.get("_cookies_loaded", False)
+
 # Cookie controller for persistent login (24h)
 cookie_controller = CookieController()
 
 # Wait for cookies to load from browser before deciding auth state.
 # On first render the JS component hasn't communicated yet, so getAll() is empty.
-all_cookies = cookie_controller.getAll()
-_cookies_ready = all_cookies is not None and len(all_cookies) > 0
-
-# Try to restore session from browser cookies on page reload
-if not st.session_state["user"]:
-    if _cookies_ready:
-        access_token = cookie_controller.get("sb_access_token")
-        refresh_token = cookie_controller.get("sb_refresh_token")
+# Once cookies have arrived (or the user is authenticated) skip the round-trip.
+if not user and not cookies_loaded:
+    all_cookies = cookie_controller.getAll()
+    if all_cookies:
+        st.session_state["_cookies_loaded"] = True
+        # Try to restore session from browser cookies on page reload
+        access_token = all_cookies.get("sb_access_token")
+        refresh_token = all_cookies.get("sb_refresh_token")
         if access_token and refresh_token:
+            # Paint the loader first; Streamlit flushes it to the browser
+            # while the auth round trip is still in flight
+            loading_placeholder = st.empty()
+            loading_placeholder.markdown(_LOADING_HTML, unsafe_allow_html=True)
             user = auth_service.restore_session(access_token, refresh_token)
+            loading_placeholder.empty()
             if user:
                 st.session_state["user"] = user
             else:
@@ -97,18 +102,11 @@ if not st.session_state["user"]:
             st.session_state["_no_tokens"] = True
     elif not st.session_state.get("_no_tokens"):
         # Cookies haven't arrived yet — show loading instead of login flash
-        st.markdown(
-            """
-            <div style="display:flex;flex-direction:column;align-items:center;justify-content:center;height:60vh;">
-                <p style="color:#94a3b8;font-size:1.1rem;">Loading session...</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(_LOADING_HTML, unsafe_allow_html=True)
         st.stop()
 
 # Save tokens to cookies right after a fresh login
-if st.session_state.get("_save_tokens"):
+if st.session_state.pop("_save_tokens", False):
     cookie_controller.set(
         "sb_access_token",
         st.session_state["access_token"],
@@ -119,64 +117,91 @@ if st.session_state.get("_save_tokens"):
         st.session_state["refresh_token"],
         max_age=86400,
     )
-    del st.session_state["_save_tokens"]
+    st.session_state["_cookies_loaded"] = True
 
 # Check authentication
-if not st.session_state["user"]:
+if not user:
     login_component.render_login()
     st.stop()
 
 # User data
-current_user = st.session_state["user"]
+current_user = user
 user_id = current_user.id
 
 
-# Cached data loading functions to improve performance
-@st.cache_data(ttl=60, show_spinner=False)
-def load_user_errors(user_id: str) -> List[Dict[str, Any]]:
-    """Load user errors with 60-second cache."""
-    return db.load_data(user_id)
-
+@st.cache_data(ttl=cache.CACHE_TTL, show_spinner=False)
+def filter_user_errors(
+    user_id: str, version: int, filter_items: Tuple[Tuple[str, Any], ...]
+) -> List[Dict[str, Any]]:
+    """Apply History filters to the user's errors, cached per data version."""
+    from src.interface.streamlit import history_components as hist
 
-@st.cache_data(ttl=60, show_spinner=False)
-def load_user_sessions(user_id: str) -> List[Dict[str, Any]]:
-    """Load user study sessions with 60-second cache."""
-    return db.load_study_sessions(user_id)
+    filters = {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in filter_items
+    }
+    return hist.apply_filters(cache.load_errors(user_id), filters)
 
 
-@st.cache_data(ttl=60, show_spinner=False)
-def load_user_mock_exams(user_id: str) -> List[Dict[str, Any]]:
-    """Load user mock exams with 60-second cache."""
-    return db.load_mock_exams(user_id)
+@st.cache_data(
+    ttl=cache.CACHE_TTL, max_entries=32, show_spinner="Preparing export..."
+)
+def build_export(user_id: str, versions: Tuple[int, ...]) -> bytes:
+    """
+    Build the user's Excel export, cached per data version.
 
+    The (user_id, versions) key is O(1) to hash and changes on every write,
+    so repeated clicks reuse the file until the data actually changes.
+    """
+    from src.services import excel_service
 
-# Load all user data (with caching)
-errors = load_user_errors(user_id)
-sessions = load_user_sessions(user_id)
-mock_exams = load_user_mock_exams(user_id)
+    excel_buffer = excel_service.export_to_excel(*cache.load_all(user_id))
+    return excel_buffer.getvalue()
 
 
 # Page Renderers
+# Page modules are imported on first visit so a cold start only pays for the
+# page being opened.
 
 
-def render_dashboard() -> None:
+def render_dashboard(user_id: str) -> None:
     """Render the telemetry dashboard with advanced analytics."""
+    from src.interface.streamlit import dashboard_components as dash
+
     time_filter = st.session_state.get("time_filter", TimeFilter.DEFAULT)
-    dash.render_telemetry_dashboard(errors, sessions, mock_exams, time_filter)
+    errors, sessions, mock_exams = cache.load_all(user_id)
+    dash.render_telemetry_dashboard(
+        errors,
+        sessions,
+        mock_exams,
+        time_filter,
+        (user_id, *cache.data_versions(user_id)),
+    )
 
 
-def render_log_session() -> None:
+def render_log_session(user_id: str) -> None:
     """Render the session and exam logging interface."""
+    from src.interface.streamlit import telemetry_components as telemetry
+
     telemetry.render_tabbed_logger(user_id)
 
 
-def render_mock_analysis() -> None:
+def render_mock_analysis(user_id: str) -> None:
     """Render the mock exam analysis page."""
-    mock_analysis.render_mock_exam_analysis(mock_exams, errors)
+    from src.interface.streamlit import (
+        mock_exam_analysis_components as mock_analysis,
+    )
+
+    mock_analysis.render_mock_exam_analysis(
+        cache.load_mock_exams(user_id), cache.load_errors(user_id)
+    )
 
 
-def render_history() -> None:
+def render_history(user_id: str) -> None:
     """Render the history page with import/export functionality."""
+    errors = cache.load_errors(user_id)
+    sessions = cache.load_sessions(user_id)
+
     st.title(("History"))
 
     # Export/Import buttons
@@ -188,12 +213,12 @@ def render_history() -> None:
 
     with col3:
         if st.button("Export Data", width="stretch"):
-            # Generate Excel file
-            excel_buffer = excel_service.export_to_excel(errors, sessions, mock_exams)
+            # Generate Excel file (reused until the data changes)
+            excel_bytes = build_export(user_id, cache.data_versions(user_id))
 
             st.download_button(
                 label="Download Excel",
-                data=excel_buffer,
+                data=excel_bytes,
                 file_name=f"exam_telemetry_export_{date.today().strftime('%Y%m%d')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 width="stretch",
@@ -209,6 +234,8 @@ def render_history() -> None:
             )
 
             if uploaded_file:
+                from src.services import excel_service
+
                 errors_import, sessions_import, exams_import = (
                     excel_service.import_from_excel(uploaded_file, user_id)
                 )
@@ -231,33 +258,19 @@ def render_history() -> None:
                     )
 
                     if st.button("Confirm Import", type="primary"):
-                        # Import data
-                        success_count = 0
-
-                        # Import sessions (rename date->date_val, strip user_id)
-                        for session in sessions_import:
-                            s = session.copy()
-                            s["date_val"] = s.pop("date", date.today())
-                            s.pop("user_id", None)
-                            if db.create_study_session(user_id=user_id, **s):
-                                success_count += 1
-
-                        # Import exams
-                        for exam in exams_import:
-                            e = exam.copy()
-                            e["date_val"] = e.pop("date", date.today())
-                            e.pop("user_id", None)
-                            if db.create_mock_exam(user_id=user_id, **e):
-                                success_count += 1
-
-                        # Import errors
-                        for error in errors_import:
-                            er = error.copy()
-                            er["date_val"] = er.pop("date", date.today())
-                            er.pop("user_id", None)
-                            if db.log_error_with_session(user_id=user_id, **er):
-                                success_count += 1
+                        # Import data: one bulk insert per table
+                        with st.spinner("Importing..."):
+                            success_count = db.bulk_create_study_sessions(
+                                user_id, sessions_import
+                            )
+                            success_count += db.bulk_create_mock_exams(
+                                user_id, exams_import
+                            )
+                            # Rows already carry user_id from import_from_excel
+                            if db.log_bulk_errors(errors_import):
+                                success_count += len(errors_import)
 
+                        cache.invalidate(user_id)
                         st.success(f"Imported {success_count} records!")
                         st.session_state["show_import"] = False
                         st.rerun()
@@ -270,167 +283,140 @@ def render_history() -> None:
     tab1, tab2 = st.tabs(["Errors History", "Study Sessions"])
 
     with tab1:
-        # Existing history functionality
-        hist.render_filter_popup(errors)
-        hist.render_active_filters()
-        filters = st.session_state.history_filters
-        filtered_data = hist.apply_filters(errors, filters)
-
-        st.markdown(
-            f'<p style="color:#64748b;font-size:0.95rem;">Showing <strong>{len(filtered_data)}</strong> of <strong>{len(errors)}</strong> records</p>',
-            unsafe_allow_html=True,
-        )
-
-        if filtered_data:
-            edited_df = hist.render_editable_table(filtered_data)
-
-            if edited_df is not None:
-                col1, col2 = st.columns([3, 1])
-
-                # Handle deletes first - convert to pandas Series for operations
-                delete_col = edited_df.get("Delete")
-                if delete_col is not None and not isinstance(delete_col, pd.Series):
-                    delete_mask = pd.Series(delete_col)
-                elif delete_col is not None:
-                    delete_mask = delete_col
-                else:
-                    delete_mask = pd.Series([False] * len(edited_df))
-
-                if delete_mask.any():
-                    with col2:
-                        st.warning(
-                            f"{int(delete_mask.sum())} error(s) marked for deletion"
-                        )
-
-                # Remove delete column and rows marked for deletion before saving
-                edited_df_to_save = edited_df[~delete_mask].drop(
-                    columns=["Delete"], errors="ignore"
-                )
-
-                with col1:
-                    if st.button(
-                        ("Save Changes"),
-                        width="stretch",
-                        type="primary",
-                        key="save_errors",
-                    ):
-                        # First delete marked records
-                        if delete_mask.any():
-                            ids_to_delete = edited_df[delete_mask]["ID"].tolist()
-                            if db.delete_errors(user_id, ids_to_delete):
-                                st.success(f"Deleted {len(ids_to_delete)} error(s)!")
-
-                        # Then save updated records
-                        if len(edited_df_to_save) > 0:
-                            updated_records = cast(
-                                List[Dict[str, Any]],
-                                edited_df_to_save.to_dict("records"),
-                            )
-                            if db.update_errors(user_id, updated_records):
-                                st.success(("Changes saved successfully!"))
-
-                        st.cache_data.clear()
-                        st.rerun()
-        else:
-            st.info(("No records match your filters."))
+        _render_errors_tab(user_id, errors)
 
     with tab2:
-        st.markdown(
-            f'<p style="color:#64748b;font-size:0.95rem;">Total <strong>{len(sessions)}</strong> study sessions</p>',
-            unsafe_allow_html=True,
+        _render_sessions_tab(user_id, sessions)
+
+
+@st.fragment
+def _render_errors_tab(user_id: str, errors: List[Dict[str, Any]]) -> None:
+    """Render the editable errors history; widget reruns stay inside the tab."""
+    from src.interface.streamlit import history_components as hist
+
+    # Existing history functionality
+    hist.render_filter_popup(errors)
+    hist.render_active_filters()
+    filters = st.session_state.history_filters
+    if filters == hist.DEFAULT_HISTORY_FILTERS:
+        filtered_data = errors
+    else:
+        filter_items = tuple(
+            sorted(
+                (key, tuple(value) if isinstance(value, list) else value)
+                for key, value in filters.items()
+            )
+        )
+        filtered_data = filter_user_errors(
+            user_id, cache.data_version(user_id, cache.ERRORS), filter_items
         )
 
-        if sessions:
-            edited_sessions_df = hist.render_editable_sessions_table(sessions)
-            if edited_sessions_df is not None:
-                # Handle deletes first - convert to pandas Series for operations
-                delete_col = edited_sessions_df.get("Delete")
-                if delete_col is not None and not isinstance(delete_col, pd.Series):
-                    delete_mask = pd.Series(delete_col)
-                elif delete_col is not None:
-                    delete_mask = delete_col
-                else:
-                    delete_mask = pd.Series([False] * len(edited_sessions_df))
+    st.markdown(
+        f'<p style="color:#64748b;font-size:0.95rem;">Showing <strong>{len(filtered_data)}</strong> of <strong>{len(errors)}</strong> records</p>',
+        unsafe_allow_html=True,
+    )
 
-                if delete_mask.any():
-                    st.warning(
-                        f"{int(delete_mask.sum())} session(s) marked for deletion"
-                    )
+    if filtered_data:
+        edited_df = hist.render_editable_table(filtered_data)
 
-                # Remove delete column and rows marked for deletion before saving
-                edited_sessions_df_to_save = edited_sessions_df[~delete_mask].drop(
-                    columns=["Delete"], errors="ignore"
-                )
+        if edited_df is not None:
+            col1, col2 = st.columns([3, 1])
+
+            # Split rows marked for deletion from rows to save
+            delete_mask, edited_df_to_save = hist.split_edits(
+                edited_df, hist.ERRORS_EDITOR_KEY
+            )
+
+            if delete_mask.any():
+                with col2:
+                    st.warning(f"{int(delete_mask.sum())} error(s) marked for deletion")
 
+            with col1:
                 if st.button(
                     ("Save Changes"),
                     width="stretch",
                     type="primary",
-                    key="save_sessions",
+                    key="save_errors",
                 ):
-                    # First delete marked records
-                    if delete_mask.any():
-                        ids_to_delete = edited_sessions_df[delete_mask]["ID"].tolist()
-                        for id_val in ids_to_delete:
-                            supabase.table("study_sessions").delete().eq(
-                                "id", id_val
-                            ).execute()
+                    if not delete_mask.any() and edited_df_to_save.empty:
+                        # Nothing edited: skip the round trip and the rerun
+                        st.info("No changes to save.")
+                        return
+
+                    # Delete marked records and save edits in one transaction
+                    ids_to_delete = edited_df.loc[delete_mask, "ID"].tolist()
+                    updated_records = hist.to_records(edited_df_to_save)
+                    if db.commit_errors(user_id, ids_to_delete, updated_records):
+                        if ids_to_delete:
+                            st.success(f"Deleted {len(ids_to_delete)} error(s)!")
+                        if updated_records:
+                            st.success(("Changes saved successfully!"))
+
+                        cache.invalidate(user_id, cache.ERRORS)
+                        st.rerun(scope="app")
+                    else:
+                        st.error("Failed to save changes. Please try again.")
+    else:
+        st.info(("No records match your filters."))
+
+
+@st.fragment
+def _render_sessions_tab(user_id: str, sessions: List[Dict[str, Any]]) -> None:
+    """Render the editable study sessions table; reruns stay inside the tab."""
+    from src.interface.streamlit import history_components as hist
+
+    st.markdown(
+        f'<p style="color:#64748b;font-size:0.95rem;">Total <strong>{len(sessions)}</strong> study sessions</p>',
+        unsafe_allow_html=True,
+    )
+
+    if sessions:
+        edited_sessions_df = hist.render_editable_sessions_table(sessions)
+        if edited_sessions_df is not None:
+            # Split rows marked for deletion from rows to save
+            delete_mask, edited_sessions_df_to_save = hist.split_edits(
+                edited_sessions_df, hist.SESSIONS_EDITOR_KEY
+            )
+
+            if delete_mask.any():
+                st.warning(f"{int(delete_mask.sum())} session(s) marked for deletion")
+
+            if st.button(
+                ("Save Changes"),
+                width="stretch",
+                type="primary",
+                key="save_sessions",
+            ):
+                if not delete_mask.any() and edited_sessions_df_to_save.empty:
+                    # Nothing edited: skip the round trip and the rerun
+                    st.info("No changes to save.")
+                    return
+
+                # Delete marked records and save edits in one transaction
+                ids_to_delete = edited_sessions_df.loc[delete_mask, "ID"].tolist()
+                updated_sessions = hist.to_records(edited_sessions_df_to_save)
+                if db.commit_sessions(user_id, ids_to_delete, updated_sessions):
+                    if ids_to_delete:
                         st.success(f"Deleted {len(ids_to_delete)} session(s)!")
+                    if updated_sessions:
+                        st.success("Changes saved successfully!")
+
+                    cache.invalidate(user_id, cache.SESSIONS, cache.ERRORS)
+                    st.rerun(scope="app")
+                else:
+                    st.error("Failed to save changes. Please try again.")
+    else:
+        st.info("No study sessions found. Log some sessions to see them here!")
 
-                    # Then save updated records
-                    if len(edited_sessions_df_to_save) > 0:
-                        updated_sessions = cast(
-                            List[Dict[str, Any]],
-                            edited_sessions_df_to_save.to_dict("records"),
-                        )
-                        if db.update_sessions(user_id, updated_sessions):
-                            st.success("Changes saved successfully!")
-
-                    st.cache_data.clear()
-                    st.rerun()
-        else:
-            st.info("No study sessions found. Log some sessions to see them here!")
 
+menu = st.query_params.get("menu", "Dashboard")
 
 # Sidebar navigation
 with st.sidebar:
-    ui.render_sidebar_header()
-    # Mostra quem está logado
-    st.markdown(
-        f"""
-        <div style="padding: 10px; background: rgba(0,0,0,0.03); border-radius: 8px; margin-bottom: 20px; border: 1px solid rgba(0,0,0,0.05);">
-            <small style="color: #94a3b8; font-weight: 600; text-transform: uppercase; font-size: 0.7rem; letter-spacing: 0.05em;">Logged in as</small>
-            <div style="color: #64748b; font-weight: 500; font-size: 0.85rem; overflow: hidden; text-overflow: ellipsis;">{current_user.email}</div>
-        </div>
-    """,
-        unsafe_allow_html=True,
-    )
-
-    st.markdown('<div class="sidebar-menu">', unsafe_allow_html=True)
-    ui.render_menu_button(("Dashboard"), "Dashboard", ICON_DASHBOARD)
-    ui.render_menu_button(("Log Session"), "Log Session", ICON_LOG_ERROR)
-    ui.render_menu_button(("Mock Analysis"), "Mock Analysis", ICON_MOCK_ANALYSIS)
-    ui.render_menu_button(("History"), "History", ICON_HISTORY)
-    st.markdown("</div>", unsafe_allow_html=True)
+    # Header, signed-in user and menu go out as a single element
+    ui.render_sidebar_nav(current_user.email, _MENU_ITEMS, menu)
 
     st.markdown("---")
-    st.markdown(
-        """
-        <style>
-        div[data-testid="stSidebar"] button[kind="secondary"] {
-            background: transparent !important;
-            border: 1px solid rgba(0,0,0,0.1) !important;
-            color: #64748b !important;
-            transition: all 0.2s ease !important;
-        }
-        div[data-testid="stSidebar"] button[kind="secondary"]:hover {
-            background: rgba(0,0,0,0.05) !important;
-            border-color: rgba(0,0,0,0.15) !important;
-        }
-        </style>
-    """,
-        unsafe_allow_html=True,
-    )
     if st.button(("Log Out"), width="stretch", type="secondary"):
         auth_service.sign_out()
         st.session_state["user"] = None
@@ -441,19 +427,13 @@ with st.sidebar:
         cookie_controller.remove("sb_refresh_token")
         st.rerun()
 
-raw_menu = st.query_params.get("menu", "Dashboard")
-menu = raw_menu[0] if isinstance(raw_menu, list) else raw_menu
-st.session_state["current_menu"] = menu
-
-# Route to page
-if menu == "Dashboard":
-    render_dashboard()
-elif menu == "Log Session":
-    render_log_session()
-elif menu == "Mock Analysis":
-    render_mock_analysis()
-elif menu == "History":
-    render_history()
-else:
-    # Fallback for legacy menu items
-    render_log_session()
+# Route to page; each renderer loads only the datasets it renders
+_ROUTES = {
+    "Dashboard": render_dashboard,
+    "Log Session": render_log_session,
+    "Mock Analysis": render_mock_analysis,
+    "History": render_history,
+}
+
+# Unknown (legacy) menu items fall back to the logger
+_ROUTES.get(menu, render_log_session)(user_id)
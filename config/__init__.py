@@ -6,6 +6,7 @@ Provides centralized access to all application settings.
 
 from config.settings import (
     ASSETS_DIR,
+    AVOIDABLE_ERROR_TYPE_SET,
     AVOIDABLE_ERROR_TYPES,
     BASE_DIR,
     CSS_FILE,
@@ -57,6 +58,7 @@ __all__ = [
     "TimeFilter",
     "ASSETS_DIR",
     "AVOIDABLE_ERROR_TYPES",
+    "AVOIDABLE_ERROR_TYPE_SET",
     "BASE_DIR",
     "CSS_FILE",
     "DATA_DIR",
@@ -13,7 +13,7 @@ This module contains all configurable settings including:
 
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, FrozenSet, List, Literal, Optional
 
 # Base paths
 
@@ -467,6 +467,9 @@ AVOIDABLE_ERROR_TYPES: List[str] = [
     ErrorType.INTERPRETATION.value,
 ]
 
+# Set form of AVOIDABLE_ERROR_TYPES for membership tests
+AVOIDABLE_ERROR_TYPE_SET: FrozenSet[str] = frozenset(AVOIDABLE_ERROR_TYPES)
+
 # Difficulty Levels
 
 
@@ -521,6 +524,11 @@ class TimeFilter:
 
     DEFAULT: str = "All Time"
 
+    # Position of each option in OPTIONS, for selectbox indexes
+    OPTION_INDEX: Dict[str, int] = {
+        option: index for index, option in enumerate(OPTIONS)
+    }
+
 
 # UI Theme colors
 
@@ -0,0 +1,90 @@
+-- =====================================================
+-- MIGRATION 005: Atomic History save functions
+-- =====================================================
+-- The History page saves by deleting the rows marked for
+-- deletion and updating the edited ones. These functions
+-- do both in a single call (one round trip, one
+-- transaction) via supabase.rpc().
+--
+-- Both run as SECURITY INVOKER, so the existing RLS
+-- policies still apply on top of the user_id checks.
+-- =====================================================
+
+-- 1. Errors history
+-- Ids are compared as text because the errors table
+-- predates these migrations.
+CREATE OR REPLACE FUNCTION public.commit_error_history(
+    _user UUID,
+    _dels TEXT[],
+    _ups JSONB
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM public.errors
+    WHERE user_id = _user AND id::text = ANY(_dels);
+
+    UPDATE public.errors AS e
+    SET subject = u.subject,
+        topic = u.topic,
+        type = u.type,
+        description = u.description,
+        date = u.date,
+        difficulty = u.difficulty,
+        exam_type = u.exam_type
+    FROM jsonb_to_recordset(_ups) AS u(
+        id TEXT,
+        subject TEXT,
+        topic TEXT,
+        type TEXT,
+        description TEXT,
+        date DATE,
+        difficulty TEXT,
+        exam_type TEXT
+    )
+    WHERE e.user_id = _user AND e.id::text = u.id;
+END;
+$$;
+
+-- 2. Study sessions history
+CREATE OR REPLACE FUNCTION public.commit_session_history(
+    _user UUID,
+    _dels UUID[],
+    _ups JSONB
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM public.study_sessions
+    WHERE user_id = _user AND id = ANY(_dels);
+
+    UPDATE public.study_sessions AS s
+    SET exam_type = u.exam_type,
+        subject = u.subject,
+        total_questions = u.total_questions,
+        correct_count = u.correct_count,
+        duration_minutes = u.duration_minutes,
+        date = u.date
+    FROM jsonb_to_recordset(_ups) AS u(
+        id UUID,
+        exam_type TEXT,
+        subject TEXT,
+        total_questions INTEGER,
+        correct_count INTEGER,
+        duration_minutes NUMERIC,
+        date DATE
+    )
+    WHERE s.user_id = _user AND s.id = u.id;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.commit_error_history(UUID, TEXT[], JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.commit_session_history(UUID, UUID[], JSONB) TO authenticated;
+
+-- =====================================================
+-- MIGRATION COMPLETE
+-- =====================================================
+-- Run this in Supabase SQL Editor
+-- =====================================================
@@ -7,9 +7,14 @@ study sessions, and mock exams to power dashboard visualizations and insights.
 
 import logging
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from config import (
+    AVOIDABLE_ERROR_TYPE_SET,
     DATE_FORMAT_DISPLAY,
     DAYS_PER_MONTH,
     AccuracyZone,
@@ -20,314 +25,356 @@ from config import (
 logger = logging.getLogger(__name__)
 
 
-def count_error_types(data: List[Dict[str, Any]]) -> Dict[str, int]:
+def range_start_date(months: Optional[int]) -> Optional[date]:
     """
-    Count errors grouped by error type.
+    Get the first day included by a "last N months" filter.
 
     Args:
-        data: List of error records.
+        months: Number of months to look back. None means all time.
+                0 means current month only.
 
     Returns:
-        Dictionary mapping error type to count.
+        First included date, or None when every date is included.
     """
-    if not data:
-        return {}
+    if months is None:
+        return None
 
-    counts: Dict[str, int] = {}
-    for error in data:
-        error_type = error.get("type", "Unknown")
-        counts[error_type] = counts.get(error_type, 0) + 1
+    now = datetime.now()
 
-    return counts
+    if months == 0:
+        cutoff = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    else:
+        days_back = months * DAYS_PER_MONTH
+        cutoff = now - timedelta(days=days_back)
 
+    # First day whose midnight is at or after the cutoff
+    return (cutoff - timedelta(microseconds=1)).date() + timedelta(days=1)
 
-def count_subjects(data: List[Dict[str, Any]]) -> Dict[str, int]:
+
+def filter_data_by_range(
+    data: List[Dict[str, Any]], months: Optional[int]
+) -> List[Dict[str, Any]]:
     """
-    Count errors grouped by subject.
+    Filter data to include only entries from the last N months.
 
     Args:
         data: List of error records.
+        months: Number of months to look back. None means all time.
+                0 means current month only.
 
     Returns:
-        Dictionary mapping subject to count.
+        Filtered list of error records.
     """
     if not data:
-        return {}
+        return []
 
-    subject_counts: Dict[str, int] = {}
-    for subj in data:
-        raw_subject = subj.get("subject", "Unknown")
-        subject = raw_subject.strip() if isinstance(raw_subject, str) else "Unknown"
-        if not subject:
-            subject = "Unknown"
-        subject_counts[subject] = subject_counts.get(subject, 0) + 1
-    return subject_counts
+    first_day = range_start_date(months)
+    if first_day is None:
+        return data
+
+    filtered_data = []
+    for item in data:
+        record_day = record_date(item)
+        if record_day is not None and record_day >= first_day:
+            filtered_data.append(item)
+    return filtered_data
 
 
-def count_topics(data: List[Dict[str, Any]]) -> Dict[str, int]:
+@lru_cache(maxsize=4096)
+def parse_date_str(d: str) -> Optional[datetime]:
     """
-    Count errors grouped by topic.
+    Parse date string in display format.
+
+    Memoized: records share a small set of distinct dates, so the dashboard's
+    per-row parsing is mostly cache hits instead of strptime calls.
 
     Args:
-        data: List of error records.
+        d: Date string in DD-MM-YYYY format.
 
     Returns:
-        Dictionary mapping topic to count.
+        Datetime object or None if parsing fails.
     """
-    if not data:
-        return {}
-
-    topic_counts: Dict[str, int] = {}
-    for top in data:
-        raw_topic = top.get("topic", "Unknown")
-        topic = raw_topic.strip() if isinstance(raw_topic, str) else "Unknown"
-        if not topic:
-            topic = "Unknown"
-        topic_counts[topic] = topic_counts.get(topic, 0) + 1
-    return topic_counts
+    try:
+        return datetime.strptime(d, DATE_FORMAT_DISPLAY)
+    except Exception:
+        return None
 
 
-def count_difficulties(data: List[Dict[str, Any]]) -> Dict[str, int]:
+def record_date(item: Dict[str, Any]) -> Optional[date]:
     """
-    Count errors grouped by difficulty level.
+    Get the calendar date of a record.
+
+    Uses the "date_obj" the db_service loaders attach when they parse the
+    row, and only falls back to parsing the display string for records that
+    did not come from a loader.
 
     Args:
-        data: List of error records.
+        item: Error, session or mock exam record.
 
     Returns:
-        Dictionary mapping difficulty level to count.
+        Date of the record, or None if it has no valid date.
     """
-    if not data:
-        return {}
-
-    difficulty_counts: Dict[str, int] = {}
-    for error in data:
-        difficulty = error.get("difficulty", "Medium") or "Medium"
-        difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
+    date_obj = item.get("date_obj")
+    if isinstance(date_obj, date):
+        return date_obj
+    dt = parse_date_str(item.get("date") or "")
+    return dt.date() if dt else None
 
-    return difficulty_counts
 
-
-def filter_data_by_range(
-    data: List[Dict[str, Any]], months: Optional[int]
-) -> List[Dict[str, Any]]:
+def calculate_dashboard_metrics(
+    errors: List[Dict[str, Any]],
+    sessions: List[Dict[str, Any]],
+    error_frame: Optional[pd.DataFrame] = None,
+) -> Dict[str, Any]:
     """
-    Filter data to include only entries from the last N months.
+    Calculate the KPI values shown on the dashboard stat cards.
 
     Args:
-        data: List of error records.
-        months: Number of months to look back. None means all time.
-                0 means current month only.
+        errors: List of error records (already filtered).
+        sessions: List of study session records (already filtered).
+        error_frame: Frame from build_error_frame for the same errors, when
+            the caller already has one. Built from errors otherwise.
 
     Returns:
-        Filtered list of error records.
+        Dictionary with total, avoidable_count, avoidable_pct, avg_accuracy
+        (None when no session has an accuracy) and top_subject.
     """
-    if not data:
-        return []
+    total = len(errors)
 
-    if months is None:
-        return data
+    # One frame serves both counts below
+    if error_frame is None:
+        error_frame = build_error_frame(errors)
 
-    now = datetime.now()
+    # Avoidable count
+    avoidable_count = int(error_frame["type"].isin(AVOIDABLE_ERROR_TYPE_SET).sum())
+    avoidable_pct = (avoidable_count / total * 100) if total > 0 else 0.0
 
-    if months == 0:
-        cutoff = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    else:
-        days_back = months * DAYS_PER_MONTH
-        cutoff = now - timedelta(days=days_back)
+    # Average accuracy from study sessions (mean skips missing values)
+    accuracy_mean = pd.DataFrame(sessions, columns=["accuracy_percentage"])[
+        "accuracy_percentage"
+    ].mean()
+    avg_accuracy = None if pd.isna(accuracy_mean) else float(accuracy_mean)
 
-    filtered_data = []
-    for item in data:
-        raw_date = item.get("date")
-        if not raw_date:
-            continue
-        try:
-            dt = datetime.strptime(raw_date, DATE_FORMAT_DISPLAY)
-            if dt >= cutoff:
-                filtered_data.append(item)
-        except (TypeError, ValueError):
-            continue
-    return filtered_data
+    # Top subject by error count
+    subj_counts = count_frame_column(error_frame, "subject")
+    top_subject = (
+        max(subj_counts, key=subj_counts.__getitem__) if subj_counts else "--"
+    )
+
+    return {
+        "total": total,
+        "avoidable_count": avoidable_count,
+        "avoidable_pct": avoidable_pct,
+        "avg_accuracy": avg_accuracy,
+        "top_subject": top_subject,
+    }
+
+
+# =============================================================================
+# COLUMNAR ERROR AGGREGATION
+# =============================================================================
+
+# Error fields used by the frame-based aggregations
+ERROR_FRAME_COLUMNS: List[str] = [
+    "subject",
+    "topic",
+    "type",
+    "difficulty",
+    "exam_type",
+    "date",
+]
 
+# Label columns stored dictionary-encoded (pandas category dtype)
+ERROR_FRAME_CATEGORIES: List[str] = [
+    "subject",
+    "topic",
+    "type",
+    "difficulty",
+    "exam_type",
+]
 
-def count_entries_by_month(data: List[Dict[str, Any]]) -> Dict[str, int]:
+
+def build_error_frame(errors: List[Dict[str, Any]]) -> pd.DataFrame:
     """
-    Count errors grouped by month.
+    Build a column-oriented view of error records for vectorized counting.
+
+    The label columns are category dtype, so the frame counters, groupings
+    and equality checks run on integer codes instead of looping over the
+    records; their categories keep first-seen order. Dates are parsed once
+    into a "date_parsed" column (NaT when missing or invalid).
 
     Args:
-        data: List of error records.
+        errors: List of error records.
 
     Returns:
-        Dictionary mapping month (YYYY-MM) to count.
-    """
-    if not data:
-        return {}
+        DataFrame with ERROR_FRAME_COLUMNS plus "date_parsed".
+    """
+    frame = pd.DataFrame(errors, columns=ERROR_FRAME_COLUMNS)
+    for column in ERROR_FRAME_CATEGORIES:
+        codes, categories = pd.factorize(frame[column])
+        frame[column] = pd.Categorical.from_codes(codes, categories=categories)
+    frame["date_parsed"] = pd.to_datetime(
+        frame["date"], format=DATE_FORMAT_DISPLAY, errors="coerce"
+    )
+    return frame
 
-    counts: Dict[str, int] = {}
-    for item in data:
-        raw_date = item.get("date")
-        if not raw_date:
-            continue
-        try:
-            dt = datetime.strptime(raw_date, DATE_FORMAT_DISPLAY)
-            month_key = dt.strftime("%Y-%m")
-        except (TypeError, ValueError):
-            logger.debug(f"Invalid date format: {raw_date}")
-            continue
 
-        counts[month_key] = counts.get(month_key, 0) + 1
+def _frame_label(value: Any, default: str) -> Any:
+    """Map a missing or empty frame value to its default label."""
+    return default if pd.isna(value) or value == "" else value
 
-    return counts
 
-
-def parse_date_str(d: str) -> Optional[datetime]:
+def frame_range_mask(frame: pd.DataFrame, months: Optional[int]) -> pd.Series:
     """
-    Parse date string in display format.
+    Select the error frame rows kept by a "last N months" filter.
+
+    Vectorized counterpart of filter_data_by_range: one comparison over the
+    parsed date column. Rows without a valid date are dropped unless every
+    date is included.
 
     Args:
-        d: Date string in DD-MM-YYYY format.
+        frame: Frame from build_error_frame.
+        months: Number of months to look back. None means all time.
+                0 means current month only.
 
     Returns:
-        Datetime object or None if parsing fails.
+        Boolean Series aligned with the frame.
     """
-    try:
-        return datetime.strptime(d, DATE_FORMAT_DISPLAY)
-    except Exception:
-        return None
+    first_day = range_start_date(months)
+    if first_day is None:
+        return pd.Series(True, index=frame.index)
+    return frame["date_parsed"] >= pd.Timestamp(first_day)
 
 
-def current_and_last_month_refs(
-    ref: date,
-) -> tuple[tuple[int, int], tuple[int, int]]:
+def frame_label_mask(
+    frame: pd.DataFrame, column: str, label: str, default: str = "Unknown"
+) -> pd.Series:
     """
-    Get year/month tuples for current and previous month.
+    Select the error frame rows that count_frame_column counts under a label.
+
+    Missing and empty values match the default label, so a drill-down into
+    the default bar finds the rows behind it.
 
     Args:
-        ref: Reference date to calculate from.
+        frame: Frame from build_error_frame.
+        column: One of ERROR_FRAME_CATEGORIES.
+        label: Key returned by count_frame_column.
+        default: Label used for missing or empty values.
 
     Returns:
-        Tuple of (current_year, current_month), (last_year, last_month).
+        Boolean Series aligned with the frame.
     """
-    first_this = ref.replace(day=1)
-    last_month_last_day = first_this - date.resolution
-    first_last = last_month_last_day.replace(day=1)
-    return (first_this.year, first_this.month), (first_last.year, first_last.month)
+    values = frame[column]
+    mask = values == label
+    if label == default:
+        mask |= values.isna() | (values == "")
+    return mask
 
 
-def aggregate_monthly_stats(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _frame_slots(frame: pd.DataFrame, column: str) -> Tuple[np.ndarray, List[Any]]:
     """
-    Calculate monthly statistics comparing current vs previous month.
+    Map a category column to integer slots and the label of each slot.
 
-    Args:
-        data: List of error records.
+    Slots are the category codes, with missing values (code -1) moved to an
+    extra last slot whose label is None.
+    """
+    values = frame[column].cat
+    labels = [*values.categories, None]
+    codes = values.codes.to_numpy().astype(np.int64)
+    return np.where(codes < 0, len(labels) - 1, codes), labels
 
-    Returns:
-        Dictionary with current_total, delta percentage, top_subject, and top_type.
+
+def count_frame_column(
+    frame: pd.DataFrame, column: str, default: str = "Unknown"
+) -> Dict[str, int]:
     """
-    today = date.today()
-    (cy, cm), (ly, lm) = current_and_last_month_refs(today)
+    Count values of an error frame column.
 
-    def month_key(dt_obj: datetime) -> tuple[int, int]:
-        return (dt_obj.year, dt_obj.month)
+    Missing and empty values are counted under the default. Keys are ordered
+    by their first row in this frame, after any filtering, so max() breaks
+    ties on the earliest record like a per-record Counter would.
 
-    current_errors = []
-    last_errors = []
+    Args:
+        frame: Frame from build_error_frame.
+        column: One of ERROR_FRAME_CATEGORIES.
+        default: Label for missing or empty values.
 
-    for row in data:
-        dt = parse_date_str(row.get("date", ""))
-        if not dt:
-            continue
-        key = month_key(dt)
-        if key == (cy, cm):
-            current_errors.append(row)
-        elif key == (ly, lm):
-            last_errors.append(row)
-
-    # Totals
-    current_total = len(current_errors)
-    last_total = len(last_errors)
-
-    # Delta percentage
-    if last_total == 0:
-        delta = 100.0 if current_total > 0 else 0.0
-    else:
-        delta = ((current_total - last_total) / last_total) * 100
+    Returns:
+        Dictionary mapping value to count.
+    """
+    slots, labels = _frame_slots(frame, column)
 
-    # Subject with most errors this month
-    subject_counts = {}
-    for row in current_errors:
-        subj = row.get("subject", "Unknown") or "Unknown"
-        subject_counts[subj] = subject_counts.get(subj, 0) + 1
-    top_subject = (
-        max(subject_counts.items(), key=lambda x: x[1])[0] if subject_counts else "—"
+    # One compiled pass over the integer slots gives each distinct value's
+    # count and first row
+    uniques, first_rows, totals = np.unique(
+        slots, return_index=True, return_counts=True
     )
 
-    # Primary reason (type) this month
-    type_counts = {}
-    for row in current_errors:
-        t = row.get("type", "Other") or "Other"
-        type_counts[t] = type_counts.get(t, 0) + 1
-    top_type = max(type_counts.items(), key=lambda x: x[1])[0] if type_counts else "—"
-
-    return {
-        "current_total": current_total,
-        "delta": delta,
-        "top_subject": top_subject,
-        "top_type": top_type,
-    }
+    counts: Dict[str, int] = {}
+    # Loop over distinct values only, in first-seen order
+    for i in np.argsort(first_rows).tolist():
+        label = _frame_label(labels[uniques[i]], default)
+        counts[label] = counts.get(label, 0) + int(totals[i])
+    return counts
 
 
-def aggregate_by_topic(data: List[Dict[str, Any]]) -> Dict[str, int]:
+def count_frame_topics_by_subject(
+    frame: pd.DataFrame,
+) -> Dict[str, Dict[str, int]]:
     """
-    Count errors grouped by topic.
+    Count topics per subject from an error frame.
+
+    Counts each (subject, topic) pair of category codes in one pass, so a
+    subject drill-down is a dictionary lookup. Labels and first-seen
+    ordering follow count_frame_column, so every bar in the subject chart
+    has a matching drill-down entry.
 
     Args:
-        data: List of error records.
+        frame: Frame from build_error_frame.
 
     Returns:
-        Dictionary mapping topic names to error counts.
+        Dictionary mapping subject to a topic -> count dictionary.
     """
-    topic_counts: Dict[str, int] = {}
-    for row in data:
-        topic = row.get("topic", "Unknown") or "Unknown"
-        topic_counts[topic] = topic_counts.get(topic, 0) + 1
-    return topic_counts
+    subject_slots, subjects = _frame_slots(frame, "subject")
+    topic_slots, topics = _frame_slots(frame, "topic")
+    n_topics = len(topics)
 
+    uniques, first_rows, totals = np.unique(
+        subject_slots * n_topics + topic_slots,
+        return_index=True,
+        return_counts=True,
+    )
 
-def aggregate_by_subject(data: List[Dict[str, Any]]) -> Dict[str, int]:
-    """
-    Count errors grouped by subject.
+    grouped: Dict[str, Dict[str, int]] = {}
+    for i in np.argsort(first_rows).tolist():
+        subject_slot, topic_slot = divmod(int(uniques[i]), n_topics)
+        topic_counts = grouped.setdefault(
+            _frame_label(subjects[subject_slot], "Unknown"), {}
+        )
+        topic = _frame_label(topics[topic_slot], "Unknown")
+        topic_counts[topic] = topic_counts.get(topic, 0) + int(totals[i])
+    return grouped
 
-    Args:
-        data: List of error records.
 
-    Returns:
-        Dictionary mapping subject names to error counts.
+def count_frame_by_month(frame: pd.DataFrame) -> Dict[str, int]:
     """
-    subject_counts: Dict[str, int] = {}
-    for row in data:
-        subj = row.get("subject", "Unknown") or "Unknown"
-        subject_counts[subj] = subject_counts.get(subj, 0) + 1
-    return subject_counts
+    Count errors per month label (e.g., "Dec 2025") from an error frame.
 
-
-def aggregate_by_month_all(data: List[Dict[str, Any]]) -> Dict[str, int]:
-    """
-    Count errors grouped by month label.
+    Months are sorted on their Period index so the labels come out in
+    chronological order and never need to be parsed back to be sorted. Rows
+    without a valid date are skipped.
 
     Args:
-        data: List of error records.
+        frame: Frame from build_error_frame.
 
     Returns:
-        Dictionary mapping month labels (e.g., "Dec 2025") to counts.
+        Dictionary mapping month labels to counts, oldest month first.
     """
-    month_counts: Dict[str, int] = {}
-    for row in data:
-        dt = parse_date_str(row.get("date", ""))
-        if dt:
-            month_str = dt.strftime("%b %Y")
-            month_counts[month_str] = month_counts.get(month_str, 0) + 1
-    return month_counts
+    months = frame["date_parsed"].dropna().dt.to_period("M")
+    return {
+        period.strftime("%b %Y"): int(count)
+        for period, count in months.value_counts().sort_index().items()
+    }
 
 
 # =============================================================================
@@ -652,9 +699,9 @@ def get_activity_heatmap_data(
 
     # Aggregate sessions
     for session in sessions:
-        dt = parse_date_str(session.get("date", ""))
-        if dt and start_date <= dt.date() <= end_date:
-            date_key = dt.strftime("%Y-%m-%d")
+        record_day = record_date(session)
+        if record_day and start_date <= record_day <= end_date:
+            date_key = record_day.strftime("%Y-%m-%d")
             activity_map[date_key]["questions_answered"] += session.get(
                 "total_questions", 0
             )
@@ -662,16 +709,16 @@ def get_activity_heatmap_data(
 
     # Aggregate errors
     for error in errors:
-        dt = parse_date_str(error.get("date", ""))
-        if dt and start_date <= dt.date() <= end_date:
-            date_key = dt.strftime("%Y-%m-%d")
+        record_day = record_date(error)
+        if record_day and start_date <= record_day <= end_date:
+            date_key = record_day.strftime("%Y-%m-%d")
             activity_map[date_key]["errors_logged"] += 1
 
     # Aggregate mock exams
     for exam in mock_exams:
-        dt = parse_date_str(exam.get("date", ""))
-        if dt and start_date <= dt.date() <= end_date:
-            date_key = dt.strftime("%Y-%m-%d")
+        record_day = record_date(exam)
+        if record_day and start_date <= record_day <= end_date:
+            date_key = record_day.strftime("%Y-%m-%d")
             activity_map[date_key]["exams_taken"] += 1
 
     # Convert to list and add intensity score
@@ -861,24 +908,6 @@ def get_mock_exam_error_summary(
     return grouped
 
 
-def count_by_field(data: List[Dict[str, Any]], field: str) -> Dict[str, int]:
-    """
-    Count occurrences of values in a specific field.
-
-    Args:
-        data: List of records
-        field: Field name to count by
-
-    Returns:
-        Dictionary mapping values to counts
-    """
-    counts: Dict[str, int] = {}
-    for item in data:
-        val = item.get(field, "Unknown") or "Unknown"
-        counts[val] = counts.get(val, 0) + 1
-    return counts
-
-
 def get_pace_by_subject(sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Calculate average pace (minutes per question) by subject.
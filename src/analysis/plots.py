@@ -6,6 +6,7 @@ Includes advanced visualizations for speed/accuracy analysis and performance tra
 """
 
 from datetime import datetime
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Union
 
 import altair as alt
@@ -94,7 +95,7 @@ def chart_topics(topic_data: Optional[Dict[str, int]]) -> Optional[alt.Chart]:
     if not topic_data:
         return None
 
-    sorted_topics = sorted(topic_data.items(), key=lambda x: x[1], reverse=True)[
+    sorted_topics = sorted(topic_data.items(), key=itemgetter(1), reverse=True)[
         : ChartConfig.TOP_TOPICS_LIMIT
     ]
     df = pd.DataFrame(sorted_topics, columns=["Topic", "Errors"])
@@ -117,7 +118,8 @@ def chart_timeline(month_data: Optional[Dict[str, int]]) -> Optional[alt.Chart]:
     Create a bar chart showing error trends over time.
 
     Args:
-        month_data: Dictionary mapping month labels to error counts.
+        month_data: Dictionary mapping month labels to error counts, in
+            chronological order (see metrics.count_frame_by_month).
 
     Returns:
         Altair chart object or None if no data.
@@ -125,11 +127,9 @@ def chart_timeline(month_data: Optional[Dict[str, int]]) -> Optional[alt.Chart]:
     if not month_data:
         return None
 
-    sorted_months = sorted(
-        month_data.items(),
-        key=lambda x: datetime.strptime(x[0], "%b %Y"),
+    df = pd.DataFrame(
+        {"Month": list(month_data.keys()), "Errors": list(month_data.values())}
     )
-    df = pd.DataFrame(sorted_months, columns=["Month", "Errors"])
 
     chart = (
         alt.Chart(df)
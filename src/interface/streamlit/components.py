@@ -4,56 +4,135 @@ Streamlit UI components for the Error Autopsy application.
 Provides reusable components for rendering headers, cards, charts, and insights.
 """
 
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
 import streamlit as st
 
 
-def render_sidebar_header() -> None:
-    """Render the application logo and title in the sidebar."""
-    st.markdown(
-        """
-        <div class="sidebar-header-container">
-            <div class="sidebar-logo-wrapper">
-                <div class="sidebar-logo">
-                    <svg viewBox="0 0 24 24" fill="white">
-                        <path d="M12 2c.2 0 .4.1.5.3l2.3 4.7 5.2.8c.2 0 .4.2.4.4s-.1.4-.3.5l-3.8 3.7.9 5.2c0 .2-.1.4-.3.5-.2.1-.4.1-.6 0L12 15.2l-4.7 2.5c-.2.1-.4.1-.6 0-.2-.1-.3-.3-.3-.5l.9-5.2-3.8-3.7c-.2-.1-.3-.3-.3-.5s.2-.4.4-.4l5.2-.8 2.3-4.7c.1-.2.3-.3.5-.3z"/>
-                    </svg>
-                </div>
-            </div>
-            <div class="sidebar-title-group">
-                <h1>AUTOPSY</h1>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
+# Sidebar markup. Fragments are flush-left with no blank lines so that,
+# joined together, they still render as a single HTML block.
+_SIDEBAR_HEADER_HTML: str = """<div class="sidebar-header-container">
+<div class="sidebar-logo-wrapper">
+<div class="sidebar-logo">
+<svg viewBox="0 0 24 24" fill="white">
+<path d="M12 2c.2 0 .4.1.5.3l2.3 4.7 5.2.8c.2 0 .4.2.4.4s-.1.4-.3.5l-3.8 3.7.9 5.2c0 .2-.1.4-.3.5-.2.1-.4.1-.6 0L12 15.2l-4.7 2.5c-.2.1-.4.1-.6 0-.2-.1-.3-.3-.3-.5l.9-5.2-3.8-3.7c-.2-.1-.3-.3-.3-.5s.2-.4.4-.4l5.2-.8 2.3-4.7c.1-.2.3-.3.5-.3z"/>
+</svg>
+</div>
+</div>
+<div class="sidebar-title-group">
+<h1>AUTOPSY</h1>
+</div>
+</div>"""
+
+_LOGGED_IN_TEMPLATE: str = """<div style="padding: 10px; background: rgba(0,0,0,0.03); border-radius: 8px; margin-bottom: 20px; border: 1px solid rgba(0,0,0,0.05);">
+<small style="color: #94a3b8; font-weight: 600; text-transform: uppercase; font-size: 0.7rem; letter-spacing: 0.05em;">Logged in as</small>
+<div style="color: #64748b; font-weight: 500; font-size: 0.85rem; overflow: hidden; text-overflow: ellipsis;">{email}</div>
+</div>"""
+
+_MENU_BUTTON_TEMPLATE: str = """<form method="get">
+<input type="hidden" name="menu" value="{value}" />
+<button type="submit" class="menu-button{active_class}" data-menu="{value}">
+{icon_svg}
+<span>{label}</span>
+<div class="indicator"></div>
+</button>
+</form>"""
+
+
+@lru_cache(maxsize=8)
+def _sidebar_menu_html(
+    menu_items: Tuple[Tuple[str, str, str], ...], active_menu: str
+) -> str:
+    """Build the menu markup once per menu item set and active entry."""
+    buttons = "".join(
+        _MENU_BUTTON_TEMPLATE.format(
+            label=label,
+            value=value,
+            icon_svg=icon_svg,
+            active_class=" active" if value == active_menu else "",
+        )
+        for label, value, icon_svg in menu_items
     )
+    return f'<div class="sidebar-menu">{buttons}</div>'
 
 
-def render_menu_button(label: str, value: str, icon_svg: str) -> None:
+def render_sidebar_nav(
+    user_email: str,
+    menu_items: Tuple[Tuple[str, str, str], ...],
+    active_menu: str,
+) -> None:
     """
-    Render a navigation button in the sidebar.
+    Render the sidebar header, signed-in user and menu as one element.
+
+    A single markdown call sends one element per rerun instead of one per
+    block, and lets the sidebar-menu wrapper actually contain the buttons.
+    The active button gets its .active styling in the markup itself.
 
     Args:
-        label: Display text for the button.
-        value: Menu value submitted when clicked.
-        icon_svg: SVG markup for the button icon.
+        user_email: Email shown under "Logged in as".
+        menu_items: (label, menu value, icon SVG) for each menu button.
+        active_menu: Menu value of the current page.
     """
     st.sidebar.markdown(
-        f"""
-        <form method="get">
-            <input type="hidden" name="menu" value="{value}" />
-            <button type="submit" class="menu-button" data-menu="{value}">
-                {icon_svg}
-                <span>{label}</span>
-                <div class="indicator"></div>
-            </button>
-        </form>
-        """,
+        _SIDEBAR_HEADER_HTML
+        + _LOGGED_IN_TEMPLATE.format(email=user_email)
+        + _sidebar_menu_html(menu_items, active_menu),
         unsafe_allow_html=True,
     )
 
 
+# Static markup templates; only the bracketed fields change per call
+_METRIC_PILL_TEMPLATE: str = '<div class="metric-pill {pill_class}">{pill_text}</div>'
+_METRIC_CARD_TEMPLATE: str = '<div class="metric-card"><div class="metric-header"><div class="metric-icon" style="background:{icon_bg}; color:{icon_color};">{icon_char}</div>{pill_html}</div><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>'
+
+_CHART_HEADER_TEMPLATE: str = """
+        <h3 style="font-family:'Helvetica Neue', sans-serif; font-size:1.35rem; font-weight:800; color:#0f172a; margin:0 0 0.4rem 0; letter-spacing:0.08em; text-transform:uppercase;">Error Concentration</h3>
+        <p style="font-family:'Helvetica Neue', sans-serif; font-size:0.95rem; font-weight:500; color:#94a3b8; font-style:italic; margin:0 0 1.5rem 0;">{subtitle}</p>
+        """
+
+
+def metric_card_html(
+    label: str,
+    value: Any,
+    icon_char: str,
+    icon_bg: str = "#eef2ff",
+    icon_color: str = "#4338ca",
+    pill_text: Optional[str] = None,
+    pill_class: str = "",
+) -> str:
+    """
+    Build the markup for a metric card with icon and optional pill badge.
+
+    Args:
+        label: Card title text.
+        value: Main metric value to display.
+        icon_char: Character or SVG for the icon.
+        icon_bg: Background color for the icon.
+        icon_color: Color for the icon.
+        pill_text: Optional text for the pill badge.
+        pill_class: CSS class for pill styling.
+
+    Returns:
+        HTML string for the card.
+    """
+    pill_html = (
+        _METRIC_PILL_TEMPLATE.format(pill_class=pill_class, pill_text=pill_text)
+        if pill_text
+        else ""
+    )
+    return _METRIC_CARD_TEMPLATE.format(
+        icon_bg=icon_bg,
+        icon_color=icon_color,
+        icon_char=icon_char,
+        pill_html=pill_html,
+        label=label,
+        value=value,
+    )
+
+
 def render_metric_card(
     label: str,
     value: Any,
@@ -75,13 +154,27 @@ def render_metric_card(
         pill_text: Optional text for the pill badge.
         pill_class: CSS class for pill styling.
     """
-    pill_html = (
-        f'<div class="metric-pill {pill_class}">{pill_text}</div>' if pill_text else ""
+    html = metric_card_html(
+        label, value, icon_char, icon_bg, icon_color, pill_text, pill_class
     )
-    html = f'<div class="metric-card"><div class="metric-header"><div class="metric-icon" style="background:{icon_bg}; color:{icon_color};">{icon_char}</div>{pill_html}</div><div class="metric-label">{label}</div><div class="metric-value">{value}</div></div>'
     st.markdown(html, unsafe_allow_html=True)
 
 
+def render_metric_row(cards: List[str]) -> None:
+    """
+    Render metric cards side by side as a single element.
+
+    Replaces an st.columns row with one markdown call; the grid layout comes
+    from the .metrics-row rule in style.css.
+
+    Args:
+        cards: Card markup from metric_card_html.
+    """
+    st.markdown(
+        f'<div class="metrics-row">{"".join(cards)}</div>', unsafe_allow_html=True
+    )
+
+
 def render_diagnostic_header() -> None:
     """Render the diagnostic engine header with loading message."""
     st.markdown(
@@ -148,10 +241,21 @@ def render_chart_header(subtitle: str) -> None:
         subtitle: Descriptive text shown below the title.
     """
     st.markdown(
-        f"""
-        <h3 style="font-family:'Helvetica Neue', sans-serif; font-size:1.35rem; font-weight:800; color:#0f172a; margin:0 0 0.4rem 0; letter-spacing:0.08em; text-transform:uppercase;">Error Concentration</h3>
-        <p style="font-family:'Helvetica Neue', sans-serif; font-size:0.95rem; font-weight:500; color:#94a3b8; font-style:italic; margin:0 0 1.5rem 0;">{subtitle}</p>
-        """,
+        _CHART_HEADER_TEMPLATE.format(subtitle=subtitle), unsafe_allow_html=True
+    )
+
+
+def render_section_header(title: str, subtitle: str) -> None:
+    """
+    Render a section title with a muted subtitle using shared CSS classes.
+
+    Args:
+        title: Section heading text.
+        subtitle: Descriptive text shown below the heading.
+    """
+    st.markdown(
+        f'<h3 class="section-title">{title}</h3>'
+        f'<p class="section-subtitle">{subtitle}</p>',
         unsafe_allow_html=True,
     )
 
@@ -174,6 +278,19 @@ def render_drill_down_info(subject_name: str) -> None:
     )
 
 
+# Static advice per error type, used by generate_web_insight
+_INSIGHT_ADVICE: Dict[str, str] = {
+    "Content Gap": "Review core concepts and definitions before practicing.",
+    "Attention detail": "Read questions twice and underline key variables.",
+    "Attention Detail": "Read questions twice and underline key variables.",
+    "Time management": "Skip hard questions early; focus on 'points per minute'.",
+    "Time Management": "Skip hard questions early; focus on 'points per minute'.",
+    "Fatigue": "Optimize sleep and take breaks. Quality over quantity.",
+    "Interpretation": "Re-state the problem in your own words before solving.",
+    "Unknown": "Ensure you categorize your errors to get better tips.",
+}
+
+
 def generate_web_insight(data: List[Dict[str, Any]]) -> str:
     """
     Generate insight HTML from error data.
@@ -204,11 +321,7 @@ def generate_web_insight(data: List[Dict[str, Any]]) -> str:
         top = item.get("topic", "Unknown").strip() or "Unknown"
         err = item.get("type", "Unknown")
 
-        if sub not in hierarchy:
-            hierarchy[sub] = {}
-        if top not in hierarchy[sub]:
-            hierarchy[sub][top] = {}
-        hierarchy[sub][top][err] = hierarchy[sub][top].get(err, 0) + 1
+        hierarchy.setdefault(sub, {}).setdefault(top, Counter())[err] += 1
 
     # Find stats
     max_errors = -1
@@ -217,7 +330,7 @@ def generate_web_insight(data: List[Dict[str, Any]]) -> str:
     for sub, topics in hierarchy.items():
         for top, error_counts in topics.items():
             # Find dominant error for this topic
-            dom_err = max(error_counts.items(), key=lambda x: x[1])[0]
+            dom_err = max(error_counts.items(), key=itemgetter(1))[0]
             total_topic_errors = sum(error_counts.values())
 
             if total_topic_errors > max_errors:
@@ -229,21 +342,9 @@ def generate_web_insight(data: List[Dict[str, Any]]) -> str:
 
     target_sub, target_top, target_err, count = best_combo
 
-    # Static Advice Map
-    advice_map = {
-        "Content Gap": "Review core concepts and definitions before practicing.",
-        "Attention detail": "Read questions twice and underline key variables.",
-        "Attention Detail": "Read questions twice and underline key variables.",
-        "Time management": "Skip hard questions early; focus on 'points per minute'.",
-        "Time Management": "Skip hard questions early; focus on 'points per minute'.",
-        "Fatigue": "Optimize sleep and take breaks. Quality over quantity.",
-        "Interpretation": "Re-state the problem in your own words before solving.",
-        "Unknown": "Ensure you categorize your errors to get better tips.",
-    }
-
     # Normalize error key for lookup
     key = str(target_err).strip()
-    tip = advice_map.get(key) or advice_map.get(
+    tip = _INSIGHT_ADVICE.get(key) or _INSIGHT_ADVICE.get(
         key.title(), "Review your error log patterns."
     )
 
@@ -10,14 +10,17 @@ All charts respect the time filter.
 """
 
 from datetime import date
-from typing import Any, Dict, List
+from itertools import compress
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
 import streamlit as st
-from config import AVOIDABLE_ERROR_TYPES, EXAM_TYPES, Colors, TimeFilter
+from config import EXAM_TYPES, Colors, TimeFilter
 from config.icons import ICON_BOOK
 from src.analysis import metrics as mt
 from src.analysis import plots as pt
 from src.interface.streamlit import components as ui
+from src.services import cache_service as cache
 
 
 def render_telemetry_dashboard(
@@ -25,6 +28,7 @@ def render_telemetry_dashboard(
     sessions: List[Dict[str, Any]],
     mock_exams: List[Dict[str, Any]],
     time_filter: str,
+    data_key: Tuple[Any, ...],
 ) -> None:
     """
     Render the main dashboard with AI insights and tabbed interface.
@@ -36,6 +40,8 @@ def render_telemetry_dashboard(
         sessions: List of study session records
         mock_exams: List of mock exam records
         time_filter: Selected time filter
+        data_key: Hashable key identifying the input data (e.g. user ID and
+            data versions); aggregations are cached per key and filter
     """
 
     # Header with filters
@@ -58,7 +64,9 @@ def render_telemetry_dashboard(
         selected_filter = st.selectbox(
             "Time Period",
             options=TimeFilter.OPTIONS,
-            index=TimeFilter.OPTIONS.index(time_filter),
+            index=TimeFilter.OPTION_INDEX.get(
+                time_filter, TimeFilter.OPTION_INDEX[TimeFilter.DEFAULT]
+            ),
             key="time_filter_select",
             label_visibility="collapsed",
         )
@@ -68,27 +76,22 @@ def render_telemetry_dashboard(
         st.session_state["time_filter"] = selected_filter
         st.rerun()
 
-    # Apply time filtering
-    months = TimeFilter.MONTHS_MAP.get(selected_filter)
-    filtered_errors = mt.filter_data_by_range(errors, months)
-    filtered_sessions = mt.filter_data_by_range(sessions, months)
-
-    # Apply exam type filtering
-    if exam_type_filter:
-        filtered_errors = [
-            e for e in filtered_errors if e.get("exam_type") in exam_type_filter
-        ]
-        filtered_sessions = [
-            s for s in filtered_sessions if s.get("exam_type") in exam_type_filter
-        ]
-
-
+    # Filter and aggregate once per (data, filters)
+    agg = _aggregate_dashboard(
+        errors,
+        sessions,
+        mock_exams,
+        data_key,
+        TimeFilter.MONTHS_MAP.get(selected_filter),
+        tuple(exam_type_filter),
+    )
+    filtered_errors = agg["filtered_errors"]
 
     # ======================================================================
     # STAT CARDS ROW
     # ======================================================================
 
-    _render_stat_cards(filtered_errors, filtered_sessions)
+    _render_stat_cards(agg["stats"])
 
     # ======================================================================
     # TABBED INTERFACE
@@ -110,10 +113,7 @@ def render_telemetry_dashboard(
         # Activity Heatmap
         st.markdown("#### Activity Heatmap")
         st.caption("Daily error logging activity (contribution-style)")
-        heatmap_data = mt.get_activity_heatmap_data(
-            filtered_sessions, filtered_errors, mock_exams, days=90
-        )
-        heatmap_chart = pt.chart_activity_heatmap(heatmap_data)
+        heatmap_chart = pt.chart_activity_heatmap(agg["heatmap_data"])
         if heatmap_chart:
             st.altair_chart(heatmap_chart, use_container_width=True)
         else:
@@ -124,13 +124,8 @@ def render_telemetry_dashboard(
         # Weakest Subjects
         st.markdown("#### Weakest Subjects")
         st.caption("Subjects with the most errors")
-        subject_data = mt.aggregate_by_subject(filtered_errors)
-        if subject_data:
-            # Sort by count descending and take top 5
-            sorted_subjects = sorted(
-                subject_data.items(), key=lambda x: x[1], reverse=True
-            )[:5]
-
+        sorted_subjects = agg["top_subjects"]
+        if sorted_subjects:
             # Get max count for scaling the bars
             max_count = sorted_subjects[0][1] if sorted_subjects else 1
 
@@ -160,7 +155,9 @@ def render_telemetry_dashboard(
         st.markdown("### Detailed Analytics")
 
         # Subject Distribution (with drill-down)
-        _render_subject_section(filtered_errors, selected_filter)
+        _render_subject_section(
+            agg["subject_data"], agg["topics_by_subject"], selected_filter
+        )
 
         st.divider()
 
@@ -170,8 +167,7 @@ def render_telemetry_dashboard(
         with col_types:
             st.markdown("#### Error Types Distribution")
             st.caption("Common mistakes by category")
-            error_type_data = mt.count_error_types(filtered_errors)
-            chart = pt.chart_error_types_pie(error_type_data)
+            chart = pt.chart_error_types_pie(agg["error_type_data"])
             if chart:
                 st.altair_chart(chart, use_container_width=True)
             else:
@@ -180,8 +176,7 @@ def render_telemetry_dashboard(
         with col_diff:
             st.markdown("#### Difficulty Analysis")
             st.caption("Errors by exercise difficulty")
-            difficulty_data = mt.count_difficulties(filtered_errors)
-            chart = pt.chart_difficulties(difficulty_data)
+            chart = pt.chart_difficulties(agg["difficulty_data"])
             if chart:
                 st.altair_chart(chart, use_container_width=True)
             else:
@@ -192,20 +187,8 @@ def render_telemetry_dashboard(
         # Speed vs Accuracy Scatter
         st.markdown("#### Speed vs Accuracy")
         st.caption("Session performance correlation")
-        if filtered_sessions:
-            # Create scatter plot data
-            scatter_data = []
-            for session in filtered_sessions:
-                if session.get("pace_per_question") and session.get(
-                    "accuracy_percentage"
-                ):
-                    scatter_data.append(
-                        {
-                            "Pace (min/q)": session["pace_per_question"],
-                            "Accuracy (%)": session["accuracy_percentage"],
-                            "Subject": session.get("subject", "Unknown"),
-                        }
-                    )
+        if agg["filtered_sessions"]:
+            scatter_data = agg["scatter_data"]
 
             if scatter_data:
                 import altair as alt
@@ -237,8 +220,7 @@ def render_telemetry_dashboard(
         with col_exam:
             st.markdown("#### Errors by Exam Type")
             st.caption("Distribution across exam types")
-            exam_type_data = mt.count_by_field(filtered_errors, "exam_type")
-            chart = pt.chart_exam_type_distribution(exam_type_data)
+            chart = pt.chart_exam_type_distribution(agg["exam_type_data"])
             if chart:
                 st.altair_chart(chart, use_container_width=True)
             else:
@@ -247,8 +229,7 @@ def render_telemetry_dashboard(
         with col_pace:
             st.markdown("#### Pace per Question")
             st.caption("Average minutes per question by subject")
-            pace_data = mt.get_pace_by_subject(filtered_sessions)
-            chart = pt.chart_pace_by_subject(pace_data)
+            chart = pt.chart_pace_by_subject(agg["pace_data"])
             if chart:
                 st.altair_chart(chart, use_container_width=True)
             else:
@@ -261,8 +242,7 @@ def render_telemetry_dashboard(
         # Monthly Error Timeline
         st.markdown("#### Errors Over Time")
         st.caption("Monthly error count")
-        month_data = mt.aggregate_by_month_all(filtered_errors)
-        chart = pt.chart_timeline(month_data)
+        chart = pt.chart_timeline(agg["month_data"])
         if chart:
             st.altair_chart(chart, use_container_width=True)
         else:
@@ -274,20 +254,7 @@ def render_telemetry_dashboard(
         st.markdown("#### Mock Exam Performance Trajectory")
         st.caption("Score evolution over time")
         if mock_exams:
-            # Sort by date
-            sorted_exams = sorted(
-                mock_exams, key=lambda x: x.get("date_obj", date.today())
-            )
-
-            trajectory_data = []
-            for exam in sorted_exams:
-                trajectory_data.append(
-                    {
-                        "Date": exam.get("date", ""),
-                        "Score %": exam.get("score_percentage", 0),
-                        "Exam": exam.get("exam_name", "Unknown"),
-                    }
-                )
+            trajectory_data = agg["trajectory_data"]
 
             if trajectory_data:
                 import altair as alt
@@ -313,7 +280,7 @@ def render_telemetry_dashboard(
         # Daily Study Trend
         st.markdown("#### Daily Study Activity")
         st.caption("Questions answered per day")
-        chart = pt.chart_daily_questions(filtered_sessions)
+        chart = pt.chart_daily_questions(agg["filtered_sessions"])
         if chart:
             st.altair_chart(chart, use_container_width=True)
         else:
@@ -327,81 +294,154 @@ def render_telemetry_dashboard(
 
 
 
-def _render_stat_cards(
-    filtered_errors: List[Dict[str, Any]],
-    filtered_sessions: List[Dict[str, Any]],
-) -> None:
-    """Render the 4 KPI stat cards at the top of the dashboard."""
-    total = len(filtered_errors)
-
-    # Avoidable count
-    type_counts: Dict[str, int] = {}
-    for r in filtered_errors:
-        t = r.get("type", "Other") or "Other"
-        type_counts[t] = type_counts.get(t, 0) + 1
-    avoidable_count = sum(type_counts.get(et, 0) for et in AVOIDABLE_ERROR_TYPES)
-    avoidable_pct = (avoidable_count / total * 100) if total > 0 else 0.0
-
-    # Average accuracy from study sessions
-    accuracies = [
-        s.get("accuracy_percentage", 0)
-        for s in filtered_sessions
-        if s.get("accuracy_percentage") is not None
-    ]
-    avg_accuracy = sum(accuracies) / len(accuracies) if accuracies else 0.0
-
-    # Top subject by error count
-    subj_counts: Dict[str, int] = {}
-    for r in filtered_errors:
-        s = r.get("subject", "Unknown") or "Unknown"
-        subj_counts[s] = subj_counts.get(s, 0) + 1
-    top_subject = (
-        max(subj_counts.items(), key=lambda x: x[1])[0] if subj_counts else "--"
-    )
+@st.cache_data(ttl=cache.CACHE_TTL, max_entries=32, show_spinner=False)
+def _aggregate_dashboard(
+    _errors: List[Dict[str, Any]],
+    _sessions: List[Dict[str, Any]],
+    _mock_exams: List[Dict[str, Any]],
+    data_key: Tuple[Any, ...],
+    months: Optional[int],
+    exam_types: Tuple[str, ...],
+) -> Dict[str, Any]:
+    """
+    Filter the dashboard data and compute every aggregation it renders.
 
-    col1, col2, col3, col4 = st.columns(4)
+    The underscore-prefixed data arguments are not hashed by Streamlit;
+    data_key stands in for them so cache lookups stay cheap. It includes the
+    dataset versions, which change whenever a load is refetched.
 
-    with col1:
-        ui.render_metric_card(
-            label="Total Errors",
-            value=total,
-            icon_char="!",
-            icon_bg=Colors.CARD_TOTAL_BG,
-            icon_color=Colors.CARD_TOTAL_COLOR,
-        )
+    Args:
+        _errors: List of error records
+        _sessions: List of study session records
+        _mock_exams: List of mock exam records
+        data_key: Hashable key identifying the data above
+        months: Months to look back (see TimeFilter.MONTHS_MAP)
+        exam_types: Exam types to keep (empty keeps all)
+
+    Returns:
+        Dictionary with the filtered records, stat card values and, when any
+        errors match, the per-chart aggregations.
+    """
+    # Filter errors on their column-oriented view, which the stat cards and
+    # the per-field counts then share
+    error_frame = mt.build_error_frame(_errors)
+    error_mask = mt.frame_range_mask(error_frame, months)
+    if exam_types:
+        error_mask &= error_frame["exam_type"].isin(exam_types)
+    error_frame = error_frame[error_mask]
+    filtered_errors = list(compress(_errors, error_mask.to_numpy()))
+
+    filtered_sessions = mt.filter_data_by_range(_sessions, months)
+    if exam_types:
+        filtered_sessions = [
+            s for s in filtered_sessions if s.get("exam_type") in exam_types
+        ]
 
-    with col2:
-        ui.render_metric_card(
-            label="Avoidable Mistakes",
-            value=avoidable_count,
-            icon_char="!",
-            icon_bg=Colors.CARD_AVOIDABLE_BG,
-            icon_color=Colors.CARD_AVOIDABLE_COLOR,
-            pill_text=f"{avoidable_pct:.1f}%",
-            pill_class="pill-negative",
-        )
+    stats = mt.calculate_dashboard_metrics(
+        filtered_errors, filtered_sessions, error_frame
+    )
 
-    with col3:
-        ui.render_metric_card(
-            label="Avg Accuracy",
-            value=f"{avg_accuracy:.1f}%" if accuracies else "--",
-            icon_char="!",
-            icon_bg=Colors.CARD_ERROR_BG,
-            icon_color=Colors.CARD_ERROR_COLOR,
-        )
+    # Without errors the dashboard only shows the stat cards, so skip the
+    # chart aggregations entirely
+    if not filtered_errors:
+        return {
+            "filtered_errors": filtered_errors,
+            "filtered_sessions": filtered_sessions,
+            "stats": stats,
+        }
+
+    subject_data = mt.count_frame_column(error_frame, "subject")
+
+    # Speed vs accuracy points
+    scatter_data = []
+    for session in filtered_sessions:
+        if session.get("pace_per_question") and session.get("accuracy_percentage"):
+            scatter_data.append(
+                {
+                    "Pace (min/q)": session["pace_per_question"],
+                    "Accuracy (%)": session["accuracy_percentage"],
+                    "Subject": session.get("subject", "Unknown"),
+                }
+            )
 
-    with col4:
-        ui.render_metric_card(
-            label="Top Error Subject",
-            value=top_subject,
-            icon_char=ICON_BOOK,
-            icon_bg=Colors.CARD_SUBJECT_BG,
-            icon_color=Colors.CARD_SUBJECT_COLOR,
-        )
+    # Mock exam trajectory, sorted by date
+    sorted_exams = sorted(_mock_exams, key=lambda x: x.get("date_obj", date.today()))
+    trajectory_data = [
+        {
+            "Date": exam.get("date", ""),
+            "Score %": exam.get("score_percentage", 0),
+            "Exam": exam.get("exam_name", "Unknown"),
+        }
+        for exam in sorted_exams
+    ]
+
+    return {
+        "filtered_errors": filtered_errors,
+        "filtered_sessions": filtered_sessions,
+        "stats": stats,
+        "heatmap_data": mt.get_activity_heatmap_data(
+            filtered_sessions, filtered_errors, _mock_exams, days=90
+        ),
+        "subject_data": subject_data,
+        "topics_by_subject": mt.count_frame_topics_by_subject(error_frame),
+        # Sort by count descending and take top 5
+        "top_subjects": sorted(
+            subject_data.items(), key=itemgetter(1), reverse=True
+        )[:5],
+        "error_type_data": mt.count_frame_column(error_frame, "type"),
+        "difficulty_data": mt.count_frame_column(error_frame, "difficulty", "Medium"),
+        "exam_type_data": mt.count_frame_column(error_frame, "exam_type"),
+        "pace_data": mt.get_pace_by_subject(filtered_sessions),
+        "month_data": mt.count_frame_by_month(error_frame),
+        "scatter_data": scatter_data,
+        "trajectory_data": trajectory_data,
+    }
+
+
+def _render_stat_cards(stats: Dict[str, Any]) -> None:
+    """Render the 4 KPI stat cards at the top of the dashboard."""
+    avg_accuracy = stats["avg_accuracy"]
+
+    ui.render_metric_row(
+        [
+            ui.metric_card_html(
+                label="Total Errors",
+                value=stats["total"],
+                icon_char="!",
+                icon_bg=Colors.CARD_TOTAL_BG,
+                icon_color=Colors.CARD_TOTAL_COLOR,
+            ),
+            ui.metric_card_html(
+                label="Avoidable Mistakes",
+                value=stats["avoidable_count"],
+                icon_char="!",
+                icon_bg=Colors.CARD_AVOIDABLE_BG,
+                icon_color=Colors.CARD_AVOIDABLE_COLOR,
+                pill_text=f"{stats['avoidable_pct']:.1f}%",
+                pill_class="pill-negative",
+            ),
+            ui.metric_card_html(
+                label="Avg Accuracy",
+                value=f"{avg_accuracy:.1f}%" if avg_accuracy is not None else "--",
+                icon_char="!",
+                icon_bg=Colors.CARD_ERROR_BG,
+                icon_color=Colors.CARD_ERROR_COLOR,
+            ),
+            ui.metric_card_html(
+                label="Top Error Subject",
+                value=stats["top_subject"],
+                icon_char=ICON_BOOK,
+                icon_bg=Colors.CARD_SUBJECT_BG,
+                icon_color=Colors.CARD_SUBJECT_COLOR,
+            ),
+        ]
+    )
 
 
 def _render_subject_section(
-    filtered_errors: List[Dict[str, Any]], selected_filter: str
+    subject_data: Dict[str, int],
+    topics_by_subject: Dict[str, Dict[str, int]],
+    selected_filter: str,
 ) -> None:
     """Render the subject chart, or topic drill-down if a subject is selected."""
     target_subject = st.session_state.get("drill_down_subject")
@@ -416,10 +456,7 @@ def _render_subject_section(
         with c_text:
             ui.render_drill_down_info(target_subject)
 
-        topic_errors = [
-            e for e in filtered_errors if e.get("subject") == target_subject
-        ]
-        topic_data = mt.aggregate_by_topic(topic_errors)
+        topic_data = topics_by_subject.get(target_subject, {})
 
         if not topic_data:
             st.info(f"No topic data for {target_subject} in {selected_filter}.")
@@ -432,7 +469,6 @@ def _render_subject_section(
     else:
         # SUBJECT OVERVIEW MODE
         ui.render_chart_header("Analysis by discipline")
-        subject_data = mt.aggregate_by_subject(filtered_errors)
 
         if not subject_data:
             st.info(f"No data available for {selected_filter}. Log some errors!")
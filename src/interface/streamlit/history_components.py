@@ -4,13 +4,41 @@ History page UI components for Error Autopsy.
 Provides filter popup, editable table, and filter logic for database management.
 """
 
-from datetime import date, datetime
-from typing import Any, Dict, List, Optional, Set
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 import streamlit as st
 from config import DIFFICULTY_LEVELS, ERROR_TYPES
+from src.analysis import metrics as mt
+
+# Filter state when the user hasn't selected anything (read-only)
+DEFAULT_HISTORY_FILTERS: Mapping[str, Any] = MappingProxyType(
+    {
+        "subjects": [],
+        "topics": [],
+        "exam_types": [],
+        "error_types": [],
+        "difficulties": [],
+        "date_from": None,
+        "date_to": None,
+    }
+)
+
+# st.data_editor widget keys; their session state holds the per-row edits
+ERRORS_EDITOR_KEY = "history_data_editor"
+SESSIONS_EDITOR_KEY = "sessions_data_editor"
+
+
+def default_history_filters() -> Dict[str, Any]:
+    """Return a fresh, mutable copy of the default history filters."""
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in DEFAULT_HISTORY_FILTERS.items()
+    }
 
 
 def get_unique_values(data: List[Dict[str, Any]]) -> Dict[str, List[str]]:
@@ -49,15 +77,7 @@ def get_unique_values(data: List[Dict[str, Any]]) -> Dict[str, List[str]]:
 def render_filter_popup(all_data: List[Dict[str, Any]]) -> None:
     # Inicializa o estado se não existir
     if "history_filters" not in st.session_state:
-        st.session_state.history_filters = {
-            "subjects": [],
-            "topics": [],
-            "exam_types": [],  # Values from data
-            "error_types": [],
-            "difficulties": [],
-            "date_from": None,
-            "date_to": None,
-        }
+        st.session_state.history_filters = default_history_filters()
 
     # Pega valores únicos dos dados passados
     unique_vals = get_unique_values(all_data)
@@ -148,15 +168,7 @@ def render_filter_popup(all_data: List[Dict[str, Any]]) -> None:
 
         with col_clear:
             if st.button("Clear All", width="stretch"):
-                st.session_state.history_filters = {
-                    "subjects": [],
-                    "topics": [],
-                    "exam_types": [],
-                    "error_types": [],
-                    "difficulties": [],
-                    "date_from": None,
-                    "date_to": None,
-                }
+                st.session_state.history_filters = default_history_filters()
                 st.rerun()
 
 
@@ -225,6 +237,9 @@ def apply_filters(
     Returns:
         Filtered list of error records.
     """
+    if filters == DEFAULT_HISTORY_FILTERS:
+        return data
+
     filtered_data = data
 
     # Filter by subjects
@@ -272,17 +287,10 @@ def apply_filters(
     date_to = filters.get("date_to")
 
     if date_from or date_to:
-
-        def parse_date(date_str: str) -> Optional[date]:
-            """Parse date string in DD-MM-YYYY format."""
-            try:
-                return datetime.strptime(date_str, "%d-%m-%Y").date()
-            except (ValueError, TypeError):
-                return None
-
+        # Compare the date the loader already parsed instead of re-parsing
         filtered_data_temp = []
         for record in filtered_data:
-            record_date = parse_date(record.get("date", ""))
+            record_date = mt.record_date(record)
             if record_date:
                 if date_from and record_date < date_from:
                     continue
@@ -294,6 +302,55 @@ def apply_filters(
     return filtered_data
 
 
+def split_edits(
+    edited_df: pd.DataFrame, editor_key: str
+) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Split an edited table into its delete mask and the rows to save.
+
+    Only rows the user actually changed are returned for saving, using the
+    edit log st.data_editor keeps in session state, so untouched rows are
+    not written back.
+
+    Args:
+        edited_df: DataFrame returned by an editable table with a "Delete" column.
+        editor_key: Widget key of the st.data_editor that produced edited_df.
+
+    Returns:
+        Tuple of (boolean delete mask, changed rows without the Delete column).
+    """
+    if "Delete" in edited_df.columns:
+        delete_mask = edited_df["Delete"].fillna(False).to_numpy(dtype=bool)
+    else:
+        delete_mask = np.zeros(len(edited_df), dtype=bool)
+
+    edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+    changed_mask = np.zeros(len(edited_df), dtype=bool)
+    changed_mask[[int(row) for row in edited_rows if int(row) < len(edited_df)]] = True
+
+    rows_to_save = edited_df.loc[changed_mask & ~delete_mask].drop(
+        columns=["Delete"], errors="ignore"
+    )
+    return delete_mask, rows_to_save
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to a list of row dictionaries.
+
+    Goes through an Arrow table, which reuses the Arrow-backed columns
+    directly and yields native Python values (None for missing cells),
+    avoiding the per-cell overhead of DataFrame.to_dict("records").
+
+    Args:
+        df: DataFrame to convert.
+
+    Returns:
+        List of dictionaries mapping column name to value.
+    """
+    return pa.Table.from_pandas(df, preserve_index=False).to_pylist()
+
+
 def render_editable_table(data: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
     """
     Render a beautiful, Notion-like editable data table.
@@ -347,6 +404,10 @@ def render_editable_table(data: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
     # Only rename columns that exist
     df = df.rename(columns=rename_map)
 
+    # Arrow-backed columns are smaller for the text fields and pass to the
+    # editor without conversion
+    df = df.convert_dtypes(dtype_backend="pyarrow")
+
     # Add delete checkbox column
     df["Delete"] = False
 
@@ -413,7 +474,7 @@ def render_editable_table(data: List[Dict[str, Any]]) -> Optional[pd.DataFrame]:
         width="stretch",
         num_rows="fixed",
         hide_index=True,
-        key="history_data_editor",
+        key=ERRORS_EDITOR_KEY,
     )
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -564,6 +625,9 @@ def render_editable_sessions_table(
         ),
     }
 
+    # Arrow-backed columns pass to the editor without conversion
+    df = df.convert_dtypes(dtype_backend="pyarrow")
+
     # Add delete checkbox column
     df["Delete"] = False
 
@@ -594,7 +658,7 @@ def render_editable_sessions_table(
         width="stretch",
         num_rows="fixed",
         hide_index=True,
-        key="sessions_data_editor",
+        key=SESSIONS_EDITOR_KEY,
     )
 
     st.markdown("</div>", unsafe_allow_html=True)
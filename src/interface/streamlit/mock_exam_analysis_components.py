@@ -10,15 +10,17 @@ Provides a dedicated analysis dashboard for mock exams including:
 - Exam history
 """
 
+from operator import itemgetter
 from typing import Any, Dict, List
 
 import pandas as pd
 
 import streamlit as st
-from config import AVOIDABLE_ERROR_TYPES, EXAM_SECTION_DEFS, Colors
+from config import AVOIDABLE_ERROR_TYPE_SET, EXAM_SECTION_DEFS, Colors
 from src.analysis import metrics as mt
 from src.analysis import plots as pt
 from src.interface.streamlit import components as ui
+from src.services import cache_service as cache
 
 
 def _get_linked_errors(exams: list[dict], all_errors: list[dict]) -> list[dict]:
@@ -131,63 +133,52 @@ def _render_kpi_cards(exams: List[Dict[str, Any]]) -> None:
     """Render KPI stat cards for mock exams."""
     stats = mt.calculate_mock_exam_statistics(exams)
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        ui.render_metric_card(
-            label=("Total Exams"),
-            value=stats["total_exams"],
-            icon_char="!",
-            icon_bg=Colors.CARD_TOTAL_BG,
-            icon_color=Colors.CARD_TOTAL_COLOR,
-        )
-
-    with col2:
-        ui.render_metric_card(
-            label=("Best Score"),
-            value=f"{stats['best_score']:.1f}%",
-            icon_char="!",
-            icon_bg="#e7f5ef",
-            icon_color="#0f766e",
-        )
-
-    with col3:
-        ui.render_metric_card(
-            label=("Latest Score"),
-            value=f"{stats['latest_score']:.1f}%",
-            icon_char="!",
-            icon_bg=Colors.CARD_ERROR_BG,
-            icon_color=Colors.CARD_ERROR_COLOR,
-        )
-
-    with col4:
-        trend = stats["trend"]
-        pill_class = ""
-        if trend == "Improving":
-            pill_class = "pill-positive"
-        elif trend == "Declining":
-            pill_class = "pill-negative"
-
-        ui.render_metric_card(
-            label="Trend",
-            value=trend,
-            icon_char="!",
-            icon_bg=Colors.CARD_AVOIDABLE_BG,
-            icon_color=Colors.CARD_AVOIDABLE_COLOR,
-            pill_text=f"Avg: {stats['avg_score']:.0f}%",
-            pill_class=pill_class,
-        )
+    trend = stats["trend"]
+    pill_class = ""
+    if trend == "Improving":
+        pill_class = "pill-positive"
+    elif trend == "Declining":
+        pill_class = "pill-negative"
+
+    ui.render_metric_row(
+        [
+            ui.metric_card_html(
+                label=("Total Exams"),
+                value=stats["total_exams"],
+                icon_char="!",
+                icon_bg=Colors.CARD_TOTAL_BG,
+                icon_color=Colors.CARD_TOTAL_COLOR,
+            ),
+            ui.metric_card_html(
+                label=("Best Score"),
+                value=f"{stats['best_score']:.1f}%",
+                icon_char="!",
+                icon_bg="#e7f5ef",
+                icon_color="#0f766e",
+            ),
+            ui.metric_card_html(
+                label=("Latest Score"),
+                value=f"{stats['latest_score']:.1f}%",
+                icon_char="!",
+                icon_bg=Colors.CARD_ERROR_BG,
+                icon_color=Colors.CARD_ERROR_COLOR,
+            ),
+            ui.metric_card_html(
+                label="Trend",
+                value=trend,
+                icon_char="!",
+                icon_bg=Colors.CARD_AVOIDABLE_BG,
+                icon_color=Colors.CARD_AVOIDABLE_COLOR,
+                pill_text=f"Avg: {stats['avg_score']:.0f}%",
+                pill_class=pill_class,
+            ),
+        ]
+    )
 
 
 def _render_trajectory(exams: List[Dict[str, Any]]) -> None:
     """Render the score trajectory chart."""
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Score Trajectory</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "Score evolution over time</p>",
-        unsafe_allow_html=True,
-    )
+    ui.render_section_header("Score Trajectory", "Score evolution over time")
 
     trajectory = mt.get_mock_exam_trajectory(exams)
     chart = pt.chart_mock_exam_trajectory(trajectory)
@@ -200,12 +191,9 @@ def _render_trajectory(exams: List[Dict[str, Any]]) -> None:
 
 def _render_section_analysis(exams: List[Dict[str, Any]], exam_type: str) -> None:
     """Render section comparison and trend charts for structured exams."""
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Section Analysis</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "Performance breakdown by exam section</p>",
-        unsafe_allow_html=True,
+    ui.render_section_header(
+        "Section Analysis",
+        "Performance breakdown by exam section",
     )
 
     col_comp, col_trend = st.columns(2)
@@ -231,14 +219,14 @@ def _render_error_analysis(
     linked_errors: List[Dict[str, Any]], exam_type: str = "All"
 ) -> None:
     """Render interactive error analysis charts (subject, topic, difficulty, types)."""
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Error Analysis</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "Subject and error pattern breakdown across your mock exams</p>",
-        unsafe_allow_html=True,
+    ui.render_section_header(
+        "Error Analysis",
+        "Subject and error pattern breakdown across your mock exams",
     )
 
+    # Column-oriented view shared by every count below
+    error_frame = mt.build_error_frame(linked_errors)
+
     # --- Row 1: Subject ↔ Topic drill-down ---
     target_subject = st.session_state.get("mock_drill_down_subject")
 
@@ -254,8 +242,9 @@ def _render_error_analysis(
         with c_text:
             ui.render_drill_down_info(target_subject)
 
-        topic_errors = [e for e in linked_errors if e.get("subject") == target_subject]
-        topic_data = mt.aggregate_by_topic(topic_errors)
+        topic_data = mt.count_frame_topics_by_subject(error_frame).get(
+            target_subject, {}
+        )
 
         if topic_data:
             chart = pt.chart_topics(topic_data)
@@ -265,7 +254,7 @@ def _render_error_analysis(
             st.info(f"No topic data for {target_subject}.")
     else:
         # SUBJECT OVERVIEW MODE
-        subject_data = mt.aggregate_by_subject(linked_errors)
+        subject_data = mt.count_frame_column(error_frame, "subject")
 
         if subject_data:
             chart = pt.chart_subjects(subject_data)
@@ -311,17 +300,12 @@ def _render_error_analysis(
             section_topic_groups.items()
         ):
             with section_cols[idx]:
-                st.markdown(
-                    f"<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-                    f'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">{group_label} Topics</h3>'
-                    f'<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-                    f"Most common error topics in {group_label}</p>",
-                    unsafe_allow_html=True,
+                ui.render_section_header(
+                    f"{group_label} Topics",
+                    f"Most common error topics in {group_label}",
                 )
-                subj_errors = [
-                    e for e in linked_errors if e.get("subject") in subjects_list
-                ]
-                topic_data = mt.aggregate_by_topic(subj_errors)
+                section_frame = error_frame[error_frame["subject"].isin(subjects_list)]
+                topic_data = mt.count_frame_column(section_frame, "topic")
                 if topic_data:
                     chart = pt.chart_topics(topic_data)
                     if chart:
@@ -333,14 +317,8 @@ def _render_error_analysis(
     col_diff, col_types = st.columns(2)
 
     with col_diff:
-        st.markdown(
-            "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-            'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Difficulty Analysis</h3>'
-            '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-            "Errors by exercise difficulty</p>",
-            unsafe_allow_html=True,
-        )
-        difficulty_data = mt.count_difficulties(linked_errors)
+        ui.render_section_header("Difficulty Analysis", "Errors by exercise difficulty")
+        difficulty_data = mt.count_frame_column(error_frame, "difficulty", "Medium")
         chart = pt.chart_difficulties(difficulty_data)
         if chart:
             st.altair_chart(chart, width="stretch")
@@ -348,14 +326,8 @@ def _render_error_analysis(
             st.info("No difficulty data yet.")
 
     with col_types:
-        st.markdown(
-            "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-            'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Error Types</h3>'
-            '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-            "Common mistakes by category</p>",
-            unsafe_allow_html=True,
-        )
-        error_type_data = mt.count_error_types(linked_errors)
+        ui.render_section_header("Error Types", "Common mistakes by category")
+        error_type_data = mt.count_frame_column(error_frame, "type")
         chart = pt.chart_error_types_pie(error_type_data)
         if chart:
             st.altair_chart(chart, width="stretch")
@@ -363,35 +335,26 @@ def _render_error_analysis(
             st.info("No error type data yet.")
 
     # --- Row 4: Weakest Subjects + Avoidable Errors ---
-    _render_weakest_subjects(linked_errors)
-    _render_avoidable_errors(linked_errors)
+    _render_weakest_subjects(error_frame)
+    _render_avoidable_errors(error_frame)
 
 
-def _render_weakest_subjects(errors: List[Dict[str, Any]]) -> None:
+def _render_weakest_subjects(error_frame: pd.DataFrame) -> None:
     """Show top 3 weakest subjects with their most common error type."""
-    subject_data = mt.aggregate_by_subject(errors)
+    subject_data = mt.count_frame_column(error_frame, "subject")
     if not subject_data:
         return
 
     # Sort by error count descending
-    sorted_subjects = sorted(subject_data.items(), key=lambda x: x[1], reverse=True)[:3]
-
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Weakest Subjects</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "Top subjects to focus your study on</p>",
-        unsafe_allow_html=True,
-    )
+    sorted_subjects = sorted(subject_data.items(), key=itemgetter(1), reverse=True)[:3]
+
+    ui.render_section_header("Weakest Subjects", "Top subjects to focus your study on")
 
     cols = st.columns(len(sorted_subjects))
     for i, (subject, count) in enumerate(sorted_subjects):
         # Find most common error type for this subject
-        subj_errors = [e for e in errors if e.get("subject") == subject]
-        type_counts: Dict[str, int] = {}
-        for err in subj_errors:
-            t = err.get("type", "Other") or "Other"
-            type_counts[t] = type_counts.get(t, 0) + 1
+        subject_mask = mt.frame_label_mask(error_frame, "subject", subject)
+        type_counts = mt.count_frame_column(error_frame[subject_mask], "type", "Other")
         top_type = max(type_counts, key=type_counts.get) if type_counts else "--"
 
         with cols[i]:
@@ -406,28 +369,24 @@ def _render_weakest_subjects(errors: List[Dict[str, Any]]) -> None:
             )
 
 
-def _render_avoidable_errors(errors: List[Dict[str, Any]]) -> None:
+def _render_avoidable_errors(error_frame: pd.DataFrame) -> None:
     """Show avoidable error stats — errors that could be eliminated with better habits."""
-    total = len(errors)
+    total = len(error_frame)
     if total == 0:
         return
 
-    # Count avoidable errors
-    type_counts: Dict[str, int] = {}
-    for err in errors:
-        t = err.get("type", "Other") or "Other"
-        type_counts[t] = type_counts.get(t, 0) + 1
+    # Count avoidable errors by type and by subject on the avoidable rows
+    avoidable_frame = error_frame[error_frame["type"].isin(AVOIDABLE_ERROR_TYPE_SET)]
+    avoidable_breakdown = mt.count_frame_column(avoidable_frame, "type", "Other")
+    subj_counts = mt.count_frame_column(avoidable_frame, "subject")
 
-    avoidable_count = sum(type_counts.get(et, 0) for et in AVOIDABLE_ERROR_TYPES)
+    avoidable_count = sum(avoidable_breakdown.values())
     if avoidable_count == 0:
         return
 
     avoidable_pct = avoidable_count / total * 100
 
     # Most common avoidable type
-    avoidable_breakdown = {
-        t: c for t, c in type_counts.items() if t in AVOIDABLE_ERROR_TYPES
-    }
     top_avoidable = (
         max(avoidable_breakdown, key=avoidable_breakdown.get)
         if avoidable_breakdown
@@ -435,19 +394,11 @@ def _render_avoidable_errors(errors: List[Dict[str, Any]]) -> None:
     )
 
     # Subject most affected by avoidable errors
-    avoidable_errors = [e for e in errors if e.get("type") in AVOIDABLE_ERROR_TYPES]
-    subj_counts: Dict[str, int] = {}
-    for err in avoidable_errors:
-        s = err.get("subject", "Unknown") or "Unknown"
-        subj_counts[s] = subj_counts.get(s, 0) + 1
     top_subj = max(subj_counts, key=subj_counts.get) if subj_counts else "--"
 
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Avoidable Errors</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "Mistakes that could be eliminated with better test-taking habits</p>",
-        unsafe_allow_html=True,
+    ui.render_section_header(
+        "Avoidable Errors",
+        "Mistakes that could be eliminated with better test-taking habits",
     )
 
     col1, col2, col3 = st.columns(3)
@@ -486,13 +437,7 @@ def _render_error_breakdown(
     exams: List[Dict[str, Any]], errors: List[Dict[str, Any]]
 ) -> None:
     """Render errors linked to each mock exam."""
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Error Breakdown</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "Errors logged per mock exam</p>",
-        unsafe_allow_html=True,
-    )
+    ui.render_section_header("Error Breakdown", "Errors logged per mock exam")
 
     linked_errors = _get_linked_errors(exams, errors)
 
@@ -530,12 +475,9 @@ def _render_exam_history(
     exams: List[Dict[str, Any]], all_errors: List[Dict[str, Any]]
 ) -> None:
     """Render expandable exam history list with edit/delete capabilities."""
-    st.markdown(
-        "<h3 style=\"font-family:'Helvetica Neue',sans-serif;font-size:1.2rem;"
-        'font-weight:700;color:#0f172a;margin:0 0 0.4rem 0;">Exam History</h3>'
-        '<p style="font-size:0.9rem;color:#94a3b8;margin:0 0 1rem 0;">'
-        "All logged mock exams (click to view details, edit, or delete)</p>",
-        unsafe_allow_html=True,
+    ui.render_section_header(
+        "Exam History",
+        "All logged mock exams (click to view details, edit, or delete)",
     )
 
     for exam in exams:
@@ -641,7 +583,9 @@ def _render_exam_history(
                         if db.delete_mock_exam(exam_id, user_id):
                             st.success(("Exam deleted successfully!"))
                             st.session_state.pop(f"confirm_delete_{exam_id}", None)
-                            st.cache_data.clear()
+                            cache.invalidate(
+                                user_id, cache.MOCK_EXAMS, cache.ERRORS
+                            )
                             st.rerun()
                         else:
                             st.error(("Failed to delete exam. Please try again."))
@@ -655,8 +599,9 @@ def _render_exam_history(
 
             # Show manage errors form
             if st.session_state.get(f"managing_errors_{exam_id}", False):
+                exam_id_str = str(exam_id)
                 exam_errors = [
-                    e for e in all_errors if str(e.get("mock_exam_id")) == str(exam_id)
+                    e for e in all_errors if str(e.get("mock_exam_id")) == exam_id_str
                 ]
                 _render_manage_errors(exam, exam_errors)
 
@@ -775,7 +720,7 @@ def _render_edit_form(exam: Dict[str, Any]) -> None:
                 ):
                     st.success(("Changes saved successfully!"))
                     st.session_state.pop(f"editing_{exam_id}", None)
-                    st.cache_data.clear()
+                    cache.invalidate(user_id, cache.MOCK_EXAMS)
                     st.rerun()
                 else:
                     st.error(("Failed to save changes. Please try again."))
@@ -932,7 +877,7 @@ def _render_manage_errors(
         if success:
             st.success("Errors managed successfully!")
             st.session_state.pop(f"managing_errors_{exam_id}", None)
-            st.cache_data.clear()
+            cache.invalidate(user_id, cache.ERRORS)
             st.rerun()
         else:
             st.error("There was an issue saving some changes.")
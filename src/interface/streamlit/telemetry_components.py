@@ -19,6 +19,7 @@ from config import (
     get_subjects_for_exam,
     get_subjects_for_section,
 )
+from src.services import cache_service as cache
 from src.services import db_service as db
 
 
@@ -171,7 +172,7 @@ def render_session_logger(user_id: str) -> None:
                 )
                 st.session_state["session_form_submitted"] = True
                 # Clear cache to reload fresh data
-                st.cache_data.clear()
+                cache.invalidate(user_id, cache.SESSIONS)
 
                 # Ask if they want to log errors
                 if correct_count < total_questions:
@@ -255,98 +256,102 @@ def render_error_logger_for_session(user_id: str, session_id: str) -> None:
     if "session_bulk_errors_df" not in st.session_state:
         st.session_state.session_bulk_errors_df = pd.DataFrame(template_data)
 
-    edited_df = st.data_editor(
-        st.session_state.session_bulk_errors_df,
-        num_rows="dynamic",
-        use_container_width=True,
-        column_config={
-            "Topic": st.column_config.TextColumn(
-                "Topic",
-                help="Enter the specific topic (required)",
-                max_chars=200,
-                required=True,
-            ),
-            "Type": st.column_config.SelectboxColumn(
-                "Error Type",
-                help="Type of error",
-                options=ERROR_TYPES,
-                required=True,
-            ),
-            "Difficulty": st.column_config.SelectboxColumn(
-                "Difficulty",
-                help="Difficulty level",
-                options=DIFFICULTY_LEVELS,
-                required=True,
-            ),
-            "Description": st.column_config.TextColumn(
-                "Description",
-                help="Optional notes",
-                max_chars=500,
-            ),
-        },
-        hide_index=True,
-        key="session_error_bulk_editor",
-    )
-
-    col1, col2 = st.columns([1, 1])
-
-    with col1:
-        if st.button(
-            "Save All Errors",
-            type="primary",
+    # A form batches cell edits into a single rerun on submit
+    with st.form("session_errors_form", border=False):
+        edited_df = st.data_editor(
+            st.session_state.session_bulk_errors_df,
+            num_rows="dynamic",
             use_container_width=True,
-            key="save_session_errors_btn",
-        ):
-            valid_errors = []
-            for _, row in edited_df.iterrows():
-                if row["Topic"] and row["Topic"].strip():
-                    error_entry = {
-                        "user_id": user_id,
-                        "subject": session_subject,
-                        "topic": row["Topic"].strip(),
-                        "type": row["Type"],
-                        "difficulty": row["Difficulty"],
-                        "description": row["Description"]
-                        if pd.notna(row["Description"])
-                        else "",
-                        "date": date.today(),
-                        "exam_type": session_exam_type,
-                        "session_id": session_id,
-                    }
-                    valid_errors.append(error_entry)
+            column_config={
+                "Topic": st.column_config.TextColumn(
+                    "Topic",
+                    help="Enter the specific topic (required)",
+                    max_chars=200,
+                    required=True,
+                ),
+                "Type": st.column_config.SelectboxColumn(
+                    "Error Type",
+                    help="Type of error",
+                    options=ERROR_TYPES,
+                    required=True,
+                ),
+                "Difficulty": st.column_config.SelectboxColumn(
+                    "Difficulty",
+                    help="Difficulty level",
+                    options=DIFFICULTY_LEVELS,
+                    required=True,
+                ),
+                "Description": st.column_config.TextColumn(
+                    "Description",
+                    help="Optional notes",
+                    max_chars=500,
+                ),
+            },
+            hide_index=True,
+            key="session_error_bulk_editor",
+        )
 
-            if not valid_errors:
-                st.warning(
-                    "No valid errors to save. Please fill in at least the 'Topic' field for each error."
-                )
-            else:
-                with st.spinner(f"Saving {len(valid_errors)} error(s)..."):
-                    success = db.log_bulk_errors(valid_errors)
+        col1, col2 = st.columns([1, 1])
 
-                if success:
-                    st.success(f"Successfully logged {len(valid_errors)} error(s)!")
-                    st.cache_data.clear()
-                    st.session_state.session_bulk_errors_df = pd.DataFrame(
-                        template_data
+        with col1:
+            if st.form_submit_button(
+                "Save All Errors",
+                type="primary",
+                use_container_width=True,
+                key="save_session_errors_btn",
+            ):
+                valid_errors = []
+                for _, row in edited_df.iterrows():
+                    if row["Topic"] and row["Topic"].strip():
+                        error_entry = {
+                            "user_id": user_id,
+                            "subject": session_subject,
+                            "topic": row["Topic"].strip(),
+                            "type": row["Type"],
+                            "difficulty": row["Difficulty"],
+                            "description": row["Description"]
+                            if pd.notna(row["Description"])
+                            else "",
+                            "date": date.today(),
+                            "exam_type": session_exam_type,
+                            "session_id": session_id,
+                        }
+                        valid_errors.append(error_entry)
+
+                if not valid_errors:
+                    st.warning(
+                        "No valid errors to save. Please fill in at least the 'Topic' field for each error."
                     )
-                    st.session_state["show_error_form"] = False
-                    st.session_state.pop("last_session_id", None)
-                    st.session_state.pop("last_session_subject", None)
-                    st.session_state.pop("last_session_exam_type", None)
-                    st.session_state.pop("last_session_errors", None)
-                    st.rerun()
                 else:
-                    st.error("Failed to save errors. Please try again.")
+                    with st.spinner(f"Saving {len(valid_errors)} error(s)..."):
+                        success = db.log_bulk_errors(valid_errors)
+
+                    if success:
+                        st.success(f"Successfully logged {len(valid_errors)} error(s)!")
+                        cache.invalidate(user_id, cache.ERRORS)
+                        st.session_state.session_bulk_errors_df = pd.DataFrame(
+                            template_data
+                        )
+                        st.session_state["show_error_form"] = False
+                        st.session_state.pop("last_session_id", None)
+                        st.session_state.pop("last_session_subject", None)
+                        st.session_state.pop("last_session_exam_type", None)
+                        st.session_state.pop("last_session_errors", None)
+                        st.rerun()
+                    else:
+                        st.error("Failed to save errors. Please try again.")
 
-    with col2:
-        if st.button("Cancel", use_container_width=True, key="cancel_session_btn"):
-            st.session_state.pop("session_bulk_errors_df", None)
-            st.session_state["show_error_form"] = False
-            st.session_state.pop("last_session_id", None)
-            st.session_state.pop("last_session_subject", None)
-            st.session_state.pop("last_session_exam_type", None)
-            st.session_state.pop("last_session_errors", None)
-            st.rerun()
+        with col2:
+            if st.form_submit_button(
+                "Cancel", use_container_width=True, key="cancel_session_btn"
+            ):
+                st.session_state.pop("session_bulk_errors_df", None)
+                st.session_state["show_error_form"] = False
+                st.session_state.pop("last_session_id", None)
+                st.session_state.pop("last_session_subject", None)
+                st.session_state.pop("last_session_exam_type", None)
+                st.session_state.pop("last_session_errors", None)
+                st.rerun()
 
 
 def render_simulado_logger(user_id: str) -> None:
@@ -561,7 +566,7 @@ def render_simulado_logger(user_id: str) -> None:
                     st.session_state["simulado_form_submitted"] = True
                     st.session_state["simulado_exam_id"] = exam_id
                     # Clear cache to reload fresh data
-                    st.cache_data.clear()
+                    cache.invalidate(user_id, cache.MOCK_EXAMS)
 
                     # Store form state before clearing for error logging
                     stored_form_state = form_state.copy()
@@ -732,184 +737,188 @@ def _render_mock_exam_error_logger(user_id: str) -> None:
                 if wrong > 0:
                     sections_with_errors.append((key, sec, wrong))
 
-    edited_dfs = {}
+    # A form batches cell edits into a single rerun on submit
+    with st.form("mock_errors_form", border=False):
+        edited_dfs = {}
 
-    if sections_with_errors:
-        tabs = st.tabs(
-            [f"{sec['label']} ({wrong})" for _, sec, wrong in sections_with_errors]
-        )
-
-        for idx, (key, sec, wrong) in enumerate(sections_with_errors):
-            available_subjects = get_subjects_for_section(exam_type, key)
-            default_subject = (
-                available_subjects[0] if available_subjects else "Mathematics"
+        if sections_with_errors:
+            tabs = st.tabs(
+                [f"{sec['label']} ({wrong})" for _, sec, wrong in sections_with_errors]
             )
 
-            num_rows = wrong if wrong > 0 else 5
+            for idx, (key, sec, wrong) in enumerate(sections_with_errors):
+                available_subjects = get_subjects_for_section(exam_type, key)
+                default_subject = (
+                    available_subjects[0] if available_subjects else "Mathematics"
+                )
+
+                num_rows = wrong if wrong > 0 else 5
+
+                df_key = f"bulk_errors_df_{key}"
+                if df_key not in st.session_state:
+                    template_data = {
+                        "Subject": [default_subject] * num_rows,
+                        "Topic": [""] * num_rows,
+                        "Type": [ERROR_TYPES[0]] * num_rows,
+                        "Difficulty": ["Medium"] * num_rows,
+                        "Description": [""] * num_rows,
+                    }
+                    st.session_state[df_key] = pd.DataFrame(template_data)
+
+                with tabs[idx]:
+                    edited_dfs[key] = st.data_editor(
+                        st.session_state[df_key],
+                        num_rows="dynamic",
+                        use_container_width=True,
+                        column_config={
+                            "Subject": st.column_config.SelectboxColumn(
+                                "Subject",
+                                help="Select the subject",
+                                options=available_subjects,
+                                required=True,
+                            ),
+                            "Topic": st.column_config.TextColumn(
+                                "Topic",
+                                help="Enter the specific topic (required)",
+                                max_chars=200,
+                                required=True,
+                            ),
+                            "Type": st.column_config.SelectboxColumn(
+                                "Error Type",
+                                help="Type of error",
+                                options=ERROR_TYPES,
+                                required=True,
+                            ),
+                            "Difficulty": st.column_config.SelectboxColumn(
+                                "Difficulty",
+                                help="Difficulty level",
+                                options=DIFFICULTY_LEVELS,
+                                required=True,
+                            ),
+                            "Description": st.column_config.TextColumn(
+                                "Description",
+                                help="Optional notes",
+                                max_chars=500,
+                            ),
+                        },
+                        hide_index=True,
+                        key=f"error_bulk_editor_{key}",
+                    )
+        else:
+            available_subjects = get_subjects_for_exam(exam_type)
+            default_subject = available_subjects[0] if available_subjects else "Mathematics"
 
-            df_key = f"bulk_errors_df_{key}"
+            df_key = "bulk_errors_df_general"
             if df_key not in st.session_state:
                 template_data = {
-                    "Subject": [default_subject] * num_rows,
-                    "Topic": [""] * num_rows,
-                    "Type": [ERROR_TYPES[0]] * num_rows,
-                    "Difficulty": ["Medium"] * num_rows,
-                    "Description": [""] * num_rows,
+                    "Subject": [default_subject] * 5,
+                    "Topic": [""] * 5,
+                    "Type": [ERROR_TYPES[0]] * 5,
+                    "Difficulty": ["Medium"] * 5,
+                    "Description": [""] * 5,
                 }
                 st.session_state[df_key] = pd.DataFrame(template_data)
 
-            with tabs[idx]:
-                edited_dfs[key] = st.data_editor(
-                    st.session_state[df_key],
-                    num_rows="dynamic",
-                    use_container_width=True,
-                    column_config={
-                        "Subject": st.column_config.SelectboxColumn(
-                            "Subject",
-                            help="Select the subject",
-                            options=available_subjects,
-                            required=True,
-                        ),
-                        "Topic": st.column_config.TextColumn(
-                            "Topic",
-                            help="Enter the specific topic (required)",
-                            max_chars=200,
-                            required=True,
-                        ),
-                        "Type": st.column_config.SelectboxColumn(
-                            "Error Type",
-                            help="Type of error",
-                            options=ERROR_TYPES,
-                            required=True,
-                        ),
-                        "Difficulty": st.column_config.SelectboxColumn(
-                            "Difficulty",
-                            help="Difficulty level",
-                            options=DIFFICULTY_LEVELS,
-                            required=True,
-                        ),
-                        "Description": st.column_config.TextColumn(
-                            "Description",
-                            help="Optional notes",
-                            max_chars=500,
-                        ),
-                    },
-                    hide_index=True,
-                    key=f"error_bulk_editor_{key}",
-                )
-    else:
-        available_subjects = get_subjects_for_exam(exam_type)
-        default_subject = available_subjects[0] if available_subjects else "Mathematics"
-
-        df_key = "bulk_errors_df_general"
-        if df_key not in st.session_state:
-            template_data = {
-                "Subject": [default_subject] * 5,
-                "Topic": [""] * 5,
-                "Type": [ERROR_TYPES[0]] * 5,
-                "Difficulty": ["Medium"] * 5,
-                "Description": [""] * 5,
-            }
-            st.session_state[df_key] = pd.DataFrame(template_data)
-
-        edited_dfs["general"] = st.data_editor(
-            st.session_state[df_key],
-            num_rows="dynamic",
-            use_container_width=True,
-            column_config={
-                "Subject": st.column_config.SelectboxColumn(
-                    "Subject",
-                    help="Select the subject",
-                    options=available_subjects,
-                    required=True,
-                ),
-                "Topic": st.column_config.TextColumn(
-                    "Topic",
-                    help="Enter the specific topic (required)",
-                    max_chars=200,
-                    required=True,
-                ),
-                "Type": st.column_config.SelectboxColumn(
-                    "Error Type",
-                    help="Type of error",
-                    options=ERROR_TYPES,
-                    required=True,
-                ),
-                "Difficulty": st.column_config.SelectboxColumn(
-                    "Difficulty",
-                    help="Difficulty level",
-                    options=DIFFICULTY_LEVELS,
-                    required=True,
-                ),
-                "Description": st.column_config.TextColumn(
-                    "Description",
-                    help="Optional notes",
-                    max_chars=500,
-                ),
-            },
-            hide_index=True,
-            key="error_bulk_editor_general",
-        )
+            edited_dfs["general"] = st.data_editor(
+                st.session_state[df_key],
+                num_rows="dynamic",
+                use_container_width=True,
+                column_config={
+                    "Subject": st.column_config.SelectboxColumn(
+                        "Subject",
+                        help="Select the subject",
+                        options=available_subjects,
+                        required=True,
+                    ),
+                    "Topic": st.column_config.TextColumn(
+                        "Topic",
+                        help="Enter the specific topic (required)",
+                        max_chars=200,
+                        required=True,
+                    ),
+                    "Type": st.column_config.SelectboxColumn(
+                        "Error Type",
+                        help="Type of error",
+                        options=ERROR_TYPES,
+                        required=True,
+                    ),
+                    "Difficulty": st.column_config.SelectboxColumn(
+                        "Difficulty",
+                        help="Difficulty level",
+                        options=DIFFICULTY_LEVELS,
+                        required=True,
+                    ),
+                    "Description": st.column_config.TextColumn(
+                        "Description",
+                        help="Optional notes",
+                        max_chars=500,
+                    ),
+                },
+                hide_index=True,
+                key="error_bulk_editor_general",
+            )
 
-    # Action buttons
-    col1, col2 = st.columns([1, 1])
+        # Action buttons
+        col1, col2 = st.columns([1, 1])
 
-    with col1:
-        if st.button(
-            "Save All Errors",
-            type="primary",
-            use_container_width=True,
-            key="save_bulk_errors_btn",
-        ):
-            # Filter out empty rows (where Topic is missing)
-            valid_errors = []
-
-            for key, df in edited_dfs.items():
-                for _, row in df.iterrows():
-                    if row["Topic"] and row["Topic"].strip():
-                        error_entry = {
-                            "user_id": user_id,
-                            "subject": row["Subject"],
-                            "topic": row["Topic"].strip(),
-                            "type": row["Type"],
-                            "difficulty": row["Difficulty"],
-                            "description": row["Description"]
-                            if pd.notna(row["Description"])
-                            else "",
-                            "date": exam_date,
-                            "exam_type": exam_type,
-                            "mock_exam_id": mock_exam_id,
-                        }
-                        valid_errors.append(error_entry)
-
-            if not valid_errors:
-                st.warning(
-                    "No valid errors to save. Please fill in at least the 'Topic' field for each error."
-                )
-            else:
-                # Call the new bulk insert function with loading indicator
-                with st.spinner(f"Saving {len(valid_errors)} error(s)..."):
-                    success = db.log_bulk_errors(valid_errors)
+        with col1:
+            if st.form_submit_button(
+                "Save All Errors",
+                type="primary",
+                use_container_width=True,
+                key="save_bulk_errors_btn",
+            ):
+                # Filter out empty rows (where Topic is missing)
+                valid_errors = []
+
+                for key, df in edited_dfs.items():
+                    for _, row in df.iterrows():
+                        if row["Topic"] and row["Topic"].strip():
+                            error_entry = {
+                                "user_id": user_id,
+                                "subject": row["Subject"],
+                                "topic": row["Topic"].strip(),
+                                "type": row["Type"],
+                                "difficulty": row["Difficulty"],
+                                "description": row["Description"]
+                                if pd.notna(row["Description"])
+                                else "",
+                                "date": exam_date,
+                                "exam_type": exam_type,
+                                "mock_exam_id": mock_exam_id,
+                            }
+                            valid_errors.append(error_entry)
+
+                if not valid_errors:
+                    st.warning(
+                        "No valid errors to save. Please fill in at least the 'Topic' field for each error."
+                    )
+                else:
+                    # Call the new bulk insert function with loading indicator
+                    with st.spinner(f"Saving {len(valid_errors)} error(s)..."):
+                        success = db.log_bulk_errors(valid_errors)
 
-                if success:
-                    st.success(f"Successfully logged {len(valid_errors)} error(s)!")
-                    # Clear cache to reload fresh data
-                    st.cache_data.clear()
+                    if success:
+                        st.success(f"Successfully logged {len(valid_errors)} error(s)!")
+                        # Clear cache to reload fresh data
+                        cache.invalidate(user_id, cache.ERRORS)
 
-                    for key in edited_dfs.keys():
-                        st.session_state.pop(f"bulk_errors_df_{key}", None)
+                        for key in edited_dfs.keys():
+                            st.session_state.pop(f"bulk_errors_df_{key}", None)
 
-                    _clear_mock_exam_state()
-                    st.rerun()
-                else:
-                    st.error("Failed to save errors. Please try again.")
+                        _clear_mock_exam_state()
+                        st.rerun()
+                    else:
+                        st.error("Failed to save errors. Please try again.")
 
-    with col2:
-        if st.button("Cancel", use_container_width=True, key="cancel_bulk_btn"):
-            for key in edited_dfs.keys():
-                st.session_state.pop(f"bulk_errors_df_{key}", None)
-            _clear_mock_exam_state()
-            st.rerun()
+        with col2:
+            if st.form_submit_button(
+                "Cancel", use_container_width=True, key="cancel_bulk_btn"
+            ):
+                for key in edited_dfs.keys():
+                    st.session_state.pop(f"bulk_errors_df_{key}", None)
+                _clear_mock_exam_state()
+                st.rerun()
 
 
 def _clear_mock_exam_state() -> None:
@@ -1013,4 +1022,4 @@ def render_legacy_error_logger(user_id: str) -> None:
 
                 if success:
                     st.success("Error logged!")
-                    st.cache_data.clear()
+                    cache.invalidate(user_id, cache.ERRORS)
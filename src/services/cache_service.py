@@ -0,0 +1,161 @@
+"""
+Cached data access for the Streamlit app.
+
+Wraps the db_service loaders with st.cache_data so reruns reuse the last
+Supabase fetch, and provides per-dataset invalidation for write paths.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from src.services import db_service as db
+
+# Dataset names accepted by invalidate() and data_version()
+ERRORS = "errors"
+SESSIONS = "sessions"
+MOCK_EXAMS = "mock_exams"
+
+# Seconds before a cached load is refetched even without a write
+CACHE_TTL: int = 300
+
+
+@st.cache_resource
+def _version_registry() -> Dict[Tuple[str, str], int]:
+    """Process-wide (user_id, dataset) -> version map shared by all sessions."""
+    return {}
+
+
+@st.cache_resource
+def _fetch_registry() -> Dict[Tuple[str, str], float]:
+    """Process-wide (user_id, dataset) -> monotonic time of the last fetch."""
+    return {}
+
+
+def _record_fetch(user_id: str, dataset: str) -> None:
+    """
+    Note that a loader body ran, i.e. the dataset was fetched from Supabase.
+
+    Also bumps the dataset version, so results keyed on data_versions() are
+    recomputed when a load is refreshed by TTL expiry, not only after writes.
+    """
+    _fetch_registry()[(user_id, dataset)] = time.monotonic()
+    _bump_version(user_id, dataset)
+
+
+def _bump_version(user_id: str, dataset: str) -> None:
+    """Increment the version of a user's dataset."""
+    versions = _version_registry()
+    versions[(user_id, dataset)] = versions.get((user_id, dataset), 0) + 1
+
+
+def _is_cached(user_id: str, dataset: str) -> bool:
+    """Check whether a dataset's last fetch is still within the cache TTL."""
+    fetched_at = _fetch_registry().get((user_id, dataset))
+    return fetched_at is not None and time.monotonic() - fetched_at < CACHE_TTL
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_errors(user_id: str) -> List[Dict[str, Any]]:
+    """Load user errors, reusing the cached result across reruns."""
+    errors = db.load_data(user_id)
+    _record_fetch(user_id, ERRORS)
+    return errors
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sessions(user_id: str) -> List[Dict[str, Any]]:
+    """Load user study sessions, reusing the cached result across reruns."""
+    sessions = db.load_study_sessions(user_id)
+    _record_fetch(user_id, SESSIONS)
+    return sessions
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_mock_exams(user_id: str) -> List[Dict[str, Any]]:
+    """Load user mock exams, reusing the cached result across reruns."""
+    mock_exams = db.load_mock_exams(user_id)
+    _record_fetch(user_id, MOCK_EXAMS)
+    return mock_exams
+
+
+_LOADERS: Dict[str, Callable[..., Any]] = {
+    ERRORS: load_errors,
+    SESSIONS: load_sessions,
+    MOCK_EXAMS: load_mock_exams,
+}
+
+
+def load_all(
+    user_id: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Load errors, study sessions and mock exams concurrently.
+
+    Each load is a separate Supabase round trip, so when more than one of
+    them has to be fetched they run in threads, making a cold load cost the
+    slowest query instead of the sum. When at most one is a cache miss the
+    loaders are called directly and no thread pool is created.
+
+    Args:
+        user_id: User UUID.
+
+    Returns:
+        Tuple of (errors, sessions, mock_exams).
+    """
+    misses = sum(not _is_cached(user_id, dataset) for dataset in _LOADERS)
+    if misses <= 1:
+        return load_errors(user_id), load_sessions(user_id), load_mock_exams(user_id)
+
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(_LOADERS),
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx),
+    ) as executor:
+        f_errors = executor.submit(load_errors, user_id)
+        f_sessions = executor.submit(load_sessions, user_id)
+        f_mock_exams = executor.submit(load_mock_exams, user_id)
+        return f_errors.result(), f_sessions.result(), f_mock_exams.result()
+
+
+def data_version(user_id: str, dataset: str) -> int:
+    """
+    Get the current version of a user's dataset.
+
+    The version is bumped on every invalidation and on every fetch, including
+    TTL refreshes, and shared by all sessions, so it can be passed to other
+    cached functions to key derived results on the underlying data. Read it
+    after loading the dataset.
+
+    Args:
+        user_id: User UUID.
+        dataset: One of ERRORS, SESSIONS or MOCK_EXAMS.
+
+    Returns:
+        Monotonic version counter (0 until the first fetch or invalidation).
+    """
+    return _version_registry().get((user_id, dataset), 0)
+
+
+def data_versions(user_id: str) -> Tuple[int, ...]:
+    """Get the versions of all of a user's datasets, for use as a cache key."""
+    return tuple(data_version(user_id, dataset) for dataset in _LOADERS)
+
+
+def invalidate(user_id: str, *datasets: str) -> None:
+    """
+    Drop cached loads after a write so the next rerun refetches them.
+
+    Args:
+        user_id: User whose data was modified.
+        datasets: Datasets that were modified. Invalidates all if omitted.
+    """
+    for dataset in datasets or tuple(_LOADERS):
+        # Clear only this user's entry; other users keep their cached loads
+        _LOADERS[dataset].clear(user_id)
+        _fetch_registry().pop((user_id, dataset), None)
+        _bump_version(user_id, dataset)
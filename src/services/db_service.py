@@ -1,5 +1,6 @@
 import logging
 import os
+from contextlib import suppress
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional, cast
 
@@ -73,6 +74,7 @@ def log_bulk_errors(errors_list: List[Dict[str, Any]]) -> bool:
 
     try:
         # Format and validate all errors before insertion
+        today = date.today()
         formatted_errors = []
         for error in errors_list:
             # Skip empty entries - check topic is valid
@@ -91,7 +93,7 @@ def log_bulk_errors(errors_list: List[Dict[str, Any]]) -> bool:
                 "topic": topic.strip(),
                 "type": error_type,
                 "description": (error.get("description") or "").strip(),
-                "date": _format_date_iso(error.get("date", date.today())),
+                "date": _format_date_iso(error.get("date", today)),
                 "difficulty": error.get("difficulty", "Medium"),
                 "exam_type": error.get("exam_type", "General"),
             }
@@ -152,9 +154,10 @@ def load_data(user_id: str) -> List[Dict[str, Any]]:
             if "difficulty" not in clean_item:
                 clean_item["difficulty"] = "Medium"
 
-            # TYPE SAFETY: Strict Date Parsing
+            # TYPE SAFETY: Strict Date Parsing. An unparseable date leaves
+            # date_obj unset so date filters skip the record
             if clean_item.get("date"):
-                try:
+                with suppress(ValueError, TypeError):
                     if isinstance(clean_item["date"], str):
                         dt = datetime.strptime(
                             clean_item["date"], DATE_FORMAT_ISO
@@ -163,11 +166,6 @@ def load_data(user_id: str) -> List[Dict[str, Any]]:
                         clean_item["date"] = dt.strftime(DATE_FORMAT_DISPLAY)
                     else:
                         clean_item["date_obj"] = clean_item["date"]
-                except (ValueError, TypeError):
-                    clean_item["date_obj"] = date.today()
-                    pass
-            else:
-                clean_item["date_obj"] = date.today()
 
             processed_data.append(clean_item)
 
@@ -213,34 +211,41 @@ def log_error(
         return False
 
 
+def _clean_error_records(
+    user_id: str, updated_records: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Map edited error rows (display or column names) to table columns."""
+    today = date.today()
+    clean_records = []
+    for rec in updated_records:
+        # Handle both original column names and display names
+        rec_id = rec.get("ID") or rec.get("id")
+        if not rec_id:
+            continue
+
+        clean_records.append(
+            {
+                "id": rec_id,
+                "user_id": user_id,
+                "subject": rec.get("Subject") or rec.get("subject", ""),
+                "topic": rec.get("Topic") or rec.get("topic", ""),
+                "type": rec.get("Error Type") or rec.get("type", ""),
+                "description": rec.get("Description") or rec.get("description", ""),
+                "date": _format_date_iso(rec.get("Date") or rec.get("date", today)),
+                "difficulty": rec.get("Difficulty")
+                or rec.get("difficulty", "Medium"),
+                "exam_type": rec.get("Exam Type") or rec.get("exam_type", "General"),
+            }
+        )
+    return clean_records
+
+
 def update_errors(user_id: str, updated_records: List[Dict[str, Any]]) -> bool:
     if not supabase:
         return False
 
     try:
-        clean_records = []
-        for rec in updated_records:
-            # Handle both original column names and display names
-            rec_id = rec.get("ID") or rec.get("id")
-            if not rec_id:
-                continue
-
-            clean_records.append(
-                {
-                    "id": rec_id,
-                    "user_id": user_id,
-                    "subject": rec.get("Subject") or rec.get("subject", ""),
-                    "topic": rec.get("Topic") or rec.get("topic", ""),
-                    "type": rec.get("Error Type") or rec.get("type", ""),
-                    "description": rec.get("Description") or rec.get("description", ""),
-                    "date": _format_date_iso(
-                        rec.get("Date") or rec.get("date", date.today())
-                    ),
-                    "difficulty": rec.get("Difficulty")
-                    or rec.get("difficulty", "Medium"),
-                    "exam_type": rec.get("Exam Type") or rec.get("exam_type", "General"),
-                }
-            )
+        clean_records = _clean_error_records(user_id, updated_records)
 
         if clean_records:
             supabase.table("errors").upsert(clean_records).execute()
@@ -264,28 +269,102 @@ def delete_errors(user_id: str, error_ids: List[str]) -> bool:
     if not supabase:
         return False
 
+    if not error_ids:
+        return True
+
     try:
-        for error_id in error_ids:
-            supabase.table("errors").delete().eq("id", error_id).eq(
-                "user_id", user_id
-            ).execute()
+        supabase.table("errors").delete().in_("id", error_ids).eq(
+            "user_id", user_id
+        ).execute()
         return True
     except Exception as e:
         logger.error(f"Error deleting errors: {e}")
         return False
 
 
+def commit_errors(
+    user_id: str,
+    error_ids: List[str],
+    updated_records: List[Dict[str, Any]],
+) -> bool:
+    """
+    Delete and update error records in a single transaction.
+
+    Calls the commit_error_history database function (migration 005), so the
+    History save is one round trip and either fully applies or not at all.
+
+    Args:
+        user_id: User UUID
+        error_ids: List of error IDs to delete
+        updated_records: List of error dictionaries with updated values
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if not supabase:
+        return False
+
+    if not error_ids and not updated_records:
+        return True
+
+    try:
+        supabase.rpc(
+            "commit_error_history",
+            {
+                "_user": user_id,
+                "_dels": [str(error_id) for error_id in error_ids],
+                "_ups": _clean_error_records(user_id, updated_records),
+            },
+        ).execute()
+        return True
+    except Exception as e:
+        logger.error(f"Error committing error history: {e}")
+        return False
+
+
 # =============================================================================
 # STUDY SESSION OPERATIONS
 # =============================================================================
 
 
-def update_sessions(user_id: str, updated_records: List[Dict[str, Any]]) -> bool:
+def _clean_session_records(
+    user_id: str, updated_records: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Map edited session rows (display names) to study_sessions columns."""
+    clean_records = []
+    for rec in updated_records:
+        if not rec.get("ID"):
+            continue
+
+        # Mapping display names back to database columns
+        clean_records.append(
+            {
+                "id": rec["ID"],
+                "user_id": user_id,
+                "exam_type": rec.get("Exam Type") or "General",
+                "subject": rec.get("Subject") or "",
+                "total_questions": int(rec.get("Total Questions") or 0),
+                "correct_count": int(rec.get("Correct") or 0),
+                "duration_minutes": round(float(rec.get("Time (min)") or 0), 2),
+                "date": _format_date_iso(rec.get("Date") or date.today()),
+            }
+        )
+    return clean_records
+
+
+def commit_sessions(
+    user_id: str,
+    session_ids: List[str],
+    updated_records: List[Dict[str, Any]],
+) -> bool:
     """
-    Update multiple study session records.
+    Delete and update study session records in a single transaction.
+
+    Calls the commit_session_history database function (migration 005).
 
     Args:
         user_id: User UUID
+        session_ids: List of session IDs to delete
         updated_records: List of session dictionaries with updated values
 
     Returns:
@@ -294,32 +373,21 @@ def update_sessions(user_id: str, updated_records: List[Dict[str, Any]]) -> bool
     if not supabase:
         return False
 
-    try:
-        clean_records = []
-        for rec in updated_records:
-            if not rec.get("ID"):
-                continue
-
-            # Mapping display names back to database columns
-            clean_rec = {
-                "id": rec["ID"],
-                "user_id": user_id,
-                "exam_type": rec.get("Exam Type", "General"),
-                "subject": rec.get("Subject", ""),
-                "topics_covered": rec.get("Topics Covered", ""),
-                "questions_total": int(rec.get("Total Questions", 0)),
-                "questions_correct": int(rec.get("Correct", 0)),
-                "questions_wrong": int(rec.get("Wrong", 0)),
-                "time_spent_min": int(rec.get("Time (min)", 0)),
-                "date": _format_date_iso(rec.get("Date", date.today())),
-            }
-            clean_records.append(clean_rec)
+    if not session_ids and not updated_records:
+        return True
 
-        if clean_records:
-            supabase.table("study_sessions").upsert(clean_records).execute()
+    try:
+        supabase.rpc(
+            "commit_session_history",
+            {
+                "_user": user_id,
+                "_dels": [str(session_id) for session_id in session_ids],
+                "_ups": _clean_session_records(user_id, updated_records),
+            },
+        ).execute()
         return True
     except Exception as e:
-        logger.error(f"Error updating sessions: {e}")
+        logger.error(f"Error committing session history: {e}")
         return False
 
 
@@ -382,6 +450,64 @@ def create_study_session(
         return None
 
 
+def bulk_create_study_sessions(user_id: str, sessions: List[Dict[str, Any]]) -> int:
+    """
+    Create multiple study sessions in a single insert.
+
+    Rows failing the same checks as create_study_session are skipped.
+
+    Args:
+        user_id: User UUID (overrides any user_id in the rows)
+        sessions: List of session dictionaries with fields:
+            exam_type, subject, total_questions, correct_count,
+            duration_minutes, date
+
+    Returns:
+        Number of sessions created
+    """
+    if not supabase or not sessions:
+        return 0
+
+    try:
+        today = date.today()
+        payload = []
+        for session in sessions:
+            total_questions = int(session.get("total_questions", 0))
+            correct_count = int(session.get("correct_count", 0))
+            duration_minutes = float(session.get("duration_minutes", 0))
+
+            if (
+                total_questions <= 0
+                or not 0 <= correct_count <= total_questions
+                or duration_minutes <= 0
+            ):
+                logger.warning(f"Skipping invalid study session: {session}")
+                continue
+
+            payload.append(
+                {
+                    "user_id": user_id,
+                    "exam_type": session.get("exam_type", "General"),
+                    "subject": str(session.get("subject", "")).strip(),
+                    "total_questions": total_questions,
+                    "correct_count": correct_count,
+                    "duration_minutes": round(duration_minutes, 2),
+                    "date": _format_date_iso(session.get("date", today)),
+                }
+            )
+
+        if not payload:
+            return 0
+
+        response = supabase.table("study_sessions").insert(payload).execute()
+        return len(response.data or [])
+
+    except Exception as e:
+        logger.error(f"Error creating study sessions: {e}")
+        st.error(f"Failed to create sessions: {e}")
+        return 0
+
+
 def load_study_sessions(user_id: str) -> List[Dict[str, Any]]:
     """
     Load study sessions with optimized column selection and type safety.
@@ -424,9 +550,10 @@ def load_study_sessions(user_id: str) -> List[Dict[str, Any]]:
             clean_item["correct_count"] = correct
             clean_item["duration_minutes"] = duration
 
-            # TYPE SAFETY: Strict Date Parsing
+            # TYPE SAFETY: Strict Date Parsing. An unparseable date leaves
+            # date_obj unset so date filters skip the record
             if clean_item.get("date"):
-                try:
+                with suppress(ValueError, TypeError):
                     if isinstance(clean_item["date"], str):
                         dt = datetime.strptime(
                             clean_item["date"], DATE_FORMAT_ISO
@@ -435,11 +562,6 @@ def load_study_sessions(user_id: str) -> List[Dict[str, Any]]:
                         clean_item["date"] = dt.strftime(DATE_FORMAT_DISPLAY)
                     else:
                         clean_item["date_obj"] = clean_item["date"]
-                except (ValueError, TypeError):
-                    clean_item["date_obj"] = date.today()
-                    pass
-            else:
-                clean_item["date_obj"] = date.today()
 
             # Computed Metrics
             if total_q > 0:
@@ -595,6 +717,61 @@ def create_mock_exam(
         return None
 
 
+def bulk_create_mock_exams(user_id: str, mock_exams: List[Dict[str, Any]]) -> int:
+    """
+    Create multiple mock exams in a single insert.
+
+    Rows failing the same checks as create_mock_exam are skipped.
+
+    Args:
+        user_id: User UUID (overrides any user_id in the rows)
+        mock_exams: List of mock exam dictionaries with fields:
+            exam_name, exam_type, total_score, max_possible_score, date,
+            breakdown_json (optional), notes (optional)
+
+    Returns:
+        Number of mock exams created
+    """
+    if not supabase or not mock_exams:
+        return 0
+
+    try:
+        today = date.today()
+        payload = []
+        for exam in mock_exams:
+            total_score = float(exam.get("total_score", 0))
+            max_possible_score = float(exam.get("max_possible_score", 0))
+
+            if not 0 <= total_score <= max_possible_score or max_possible_score <= 0:
+                logger.warning(f"Skipping invalid mock exam: {exam}")
+                continue
+
+            notes = exam.get("notes")
+            payload.append(
+                {
+                    "user_id": user_id,
+                    "exam_name": str(exam.get("exam_name", "Untitled")).strip(),
+                    "exam_type": exam.get("exam_type", "General"),
+                    "total_score": round(total_score, 2),
+                    "max_possible_score": round(max_possible_score, 2),
+                    "date": _format_date_iso(exam.get("date", today)),
+                    "breakdown_json": exam.get("breakdown_json") or {},
+                    "notes": notes.strip() if notes else "",
+                }
+            )
+
+        if not payload:
+            return 0
+
+        response = supabase.table("mock_exams").insert(payload).execute()
+        return len(response.data or [])
+
+    except Exception as e:
+        logger.error(f"Error creating mock exams: {e}")
+        st.error(f"Failed to create mock exams: {e}")
+        return 0
+
+
 def load_mock_exams(user_id: str) -> List[Dict[str, Any]]:
     """
     Load mock exams with optimized column selection and type safety.
@@ -631,9 +808,10 @@ def load_mock_exams(user_id: str) -> List[Dict[str, Any]]:
         for item in raw_data:
             clean_item = item.copy()
 
-            # TYPE SAFETY: Strict Date Parsing
+            # TYPE SAFETY: Strict Date Parsing. An unparseable date leaves
+            # date_obj unset so date filters skip the record
             if clean_item.get("date"):
-                try:
+                with suppress(ValueError, TypeError):
                     if isinstance(clean_item["date"], str):
                         dt = datetime.strptime(
                             clean_item["date"], DATE_FORMAT_ISO
@@ -642,11 +820,6 @@ def load_mock_exams(user_id: str) -> List[Dict[str, Any]]:
                         clean_item["date"] = dt.strftime(DATE_FORMAT_DISPLAY)
                     else:
                         clean_item["date_obj"] = clean_item["date"]
-                except (ValueError, TypeError):
-                    clean_item["date_obj"] = date.today()
-                    pass
-            else:
-                clean_item["date_obj"] = date.today()
 
             # Ensure score_percentage exists
             total_score = clean_item.get("total_score", 0) or 0
@@ -152,7 +152,7 @@ def _import_errors_sheet(xl_file: pd.ExcelFile, user_id: str) -> List[Dict[str,
     df = pd.read_excel(xl_file, sheet_name="Errors")
 
     errors = []
-    for _, row in df.iterrows():
+    for row in df.to_dict("records"):
         try:
             error = {
                 "user_id": user_id,
@@ -185,7 +185,7 @@ def _import_sessions_sheet(xl_file: pd.ExcelFile, user_id: str) -> List[Dict[str
     df = pd.read_excel(xl_file, sheet_name="Study Sessions")
 
     sessions = []
-    for _, row in df.iterrows():
+    for row in df.to_dict("records"):
         try:
             session = {
                 "user_id": user_id,
@@ -213,7 +213,7 @@ def _import_exams_sheet(xl_file: pd.ExcelFile, user_id: str) -> List[Dict[str, A
     df = pd.read_excel(xl_file, sheet_name="Mock Exams")
 
     exams = []
-    for _, row in df.iterrows():
+    for row in df.to_dict("records"):
         try:
             exam = {
                 "user_id": user_id,
@@ -249,7 +249,7 @@ def _map_generic_to_errors(df: pd.DataFrame, user_id: str) -> List[Dict[str, Any
     # Column mapping heuristics
     col_map = _detect_columns(df.columns)
 
-    for _, row in df.iterrows():
+    for row in df.to_dict("records"):
         try:
             error = {
                 "user_id": user_id,